@@ -0,0 +1,176 @@
+"""
+Extraction backend comparison.
+
+Parses ``sampleData/`` and a set of synthetic sheets with every registered
+backend (and ``auto``), each run in a fresh process, and reports pages/sec,
+peak RSS and how many parsed rows agree with the default backend::
+
+    python -m benchmarks.backends
+    python -m benchmarks.backends --students 2000 --modules 6 --backends auto text
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from gpa_cal.backends import DEFAULT_BACKEND, backend_names
+from gpa_cal.instrumentation import Profile
+from gpa_cal.parsing import iter_sheet_rows
+
+from .run import RESULTS_DIR, _git_commit
+from .synthetic import make_sheets
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sampleData")
+
+# (registration no, module, grade) rows left after later rows win, per file
+Rows = Set[Tuple[int, str, str, Optional[str]]]
+
+
+def _peak_rss_mib() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _run(backend: str, files: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+    """One backend over one corpus; runs in its own process."""
+    rss_before = _peak_rss_mib()
+    profile = Profile()
+    rows: Rows = set()
+    start = time.perf_counter()
+    for i, source in enumerate(files):
+        effective = {}
+        for reg_no, module, grade in iter_sheet_rows(source, profile, backend):
+            effective[reg_no, module] = grade
+        rows.update((i, reg_no, module, grade) for (reg_no, module), grade in effective.items())
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "pages": profile.counters["pages"],
+        "counters": dict(profile.counters),
+        "rss_before_mib": rss_before,
+        "peak_rss_mib": _peak_rss_mib(),
+        "rows": rows,
+    }
+
+
+def run_backend(backend: str, files: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+    """Run ``backend`` over ``files`` in a fresh (spawned) process, so peak
+    RSS and the layout-template cache start clean."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run, backend, files).result()
+
+
+def load_samples(directory: str = SAMPLE_DIR) -> List[Tuple[str, bytes]]:
+    files = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.pdf"))):
+        with open(path, "rb") as fh:
+            files.append((os.path.basename(path), fh.read()))
+    return files
+
+
+def compare_corpus(
+    corpus: str, files: List[Tuple[str, bytes]], backends: List[str]
+) -> List[Dict[str, Any]]:
+    """Run every backend over one corpus; agreement is against the default backend."""
+    runs = {name: run_backend(name, files) for name in backends}
+    reference = runs[DEFAULT_BACKEND]["rows"] if DEFAULT_BACKEND in runs else None
+
+    results = []
+    for name, run in runs.items():
+        rows = run.pop("rows")
+        result = {"corpus": corpus, "backend": name, "files": len(files), **run,
+                  "rows": len(rows)}
+        result["pages_per_sec"] = run["pages"] / run["seconds"] if run["seconds"] else None
+        if reference is not None:
+            union = len(rows | reference)
+            result["rows_agreeing"] = len(rows & reference)
+            result["agreement"] = len(rows & reference) / union if union else 1.0
+        results.append(result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=backend_names(),
+                        default=list(backend_names()),
+                        help="Backends to run (default: all registered, plus auto)")
+    parser.add_argument("--samples", default=SAMPLE_DIR,
+                        help="Directory of real sheets (skipped if it has no PDFs)")
+    parser.add_argument("--students", type=int, default=1000,
+                        help="Students per synthetic sheet")
+    parser.add_argument("--modules", type=int, default=4,
+                        help="Synthetic sheets (one per module)")
+    parser.add_argument("--noise-rate", type=float, default=0.02,
+                        help="Fraction of junk rows in the synthetic sheets")
+    parser.add_argument("-o", "--output", help="Results file (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    backends = list(dict.fromkeys(args.backends))
+    corpora = []
+    samples = load_samples(args.samples)
+    if samples:
+        corpora.append(("sampleData", samples))
+    corpora.append((
+        "synthetic",
+        make_sheets(args.students, args.modules, noise_rate=args.noise_rate),
+    ))
+
+    results: List[Dict[str, Any]] = []
+    for corpus, files in corpora:
+        for r in compare_corpus(corpus, files, backends):
+            results.append(r)
+            print(_format(r))
+
+    commit = _git_commit()
+    created = datetime.now(timezone.utc)
+    payload = {
+        "commit": commit,
+        "created": created.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "reference": DEFAULT_BACKEND,
+        "results": results,
+    }
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(
+            RESULTS_DIR, f"backends-{created:%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+        )
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+    print(f"\nWrote {output}")
+    return 0
+
+
+def _format(r: Dict[str, Any]) -> str:
+    rss = "n/a" if r["peak_rss_mib"] is None else f"{r['peak_rss_mib']:7.1f} MiB"
+    agreement = r.get("agreement")
+    agree = "n/a" if agreement is None else f"{agreement * 100:6.2f}%"
+    return (
+        f"{r['corpus']:<11} {r['backend']:<11} {r['pages']:>5} pages  "
+        f"{r['pages_per_sec'] or 0:8.1f} pages/sec  peak RSS {rss}  "
+        f"rows {r['rows']:>6}  agreement {agree}"
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Pipeline benchmarks.
+
+Times ``parse_result_pdfs`` on synthetic sheets and the GPA computation
+(``build_grade_store``, which the pipeline uses, and the wide-frame
+``compute_gpa``), ``add_ranks`` and CSV export on synthetic wide frames at
+several cohort sizes, and stores the timings as JSON so runs can be compared across
+commits::
+
+    python -m benchmarks.run                      # default scales
+    python -m benchmarks.run --scales 1000 10000 --parse-students 1000 5000
+    python -m benchmarks.run --compare benchmarks/results/<older>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from gpa_cal.grading import compute_gpa
+from gpa_cal.instrumentation import Profile
+from gpa_cal.parsing import FileResult, build_grade_store, parse_result_pdfs
+from gpa_cal.ranking import add_ranks, rank_table
+
+from .synthetic import make_sheets, make_wide_frame
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best and median wall time of ``repeat`` calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times)}
+
+
+def bench_parse(students: int, modules: int, workers: int, repeat: int) -> Dict[str, Any]:
+    files = make_sheets(students, modules)
+    profile = Profile()
+    parse_result_pdfs(files, workers=workers, profile=profile)
+    timing = time_call(lambda: parse_result_pdfs(files, workers=workers), repeat)
+    return {
+        "stage": "parse_result_pdfs",
+        "students": students,
+        "modules": modules,
+        "pages": profile.counters["pages"],
+        "stages": dict(profile.timings),
+        "workers": workers,
+        **timing,
+    }
+
+
+def file_results(wide: pd.DataFrame) -> List[FileResult]:
+    """Per-sheet results (one sheet per module) holding the cells of ``wide``."""
+    reg_nos = wide["Registration No"].tolist()
+    return [
+        (module, {r: g for r, g in zip(reg_nos, wide[module].tolist()) if g is not None})
+        for module in wide.columns
+        if module != "Registration No"
+    ]
+
+
+def bench_frame_stages(
+    students: int, modules: int, density: float, repeat: int
+) -> List[Dict[str, Any]]:
+    wide = make_wide_frame(students, modules, density=density)
+    with_gpa = compute_gpa(wide.copy())
+    ranked = add_ranks(with_gpa)
+    results = file_results(wide)
+    shape = {"students": students, "modules": modules, "density": density}
+    return [
+        {"stage": "build_grade_store", **shape,
+         **time_call(lambda: build_grade_store(results), repeat)},
+        {"stage": "compute_gpa", **shape,
+         **time_call(lambda: compute_gpa(wide.copy()), repeat)},
+        {"stage": "add_ranks", **shape,
+         **time_call(lambda: add_ranks(with_gpa), repeat)},
+        {"stage": "rank_table", **shape,
+         **time_call(lambda: rank_table(with_gpa), repeat)},
+        {"stage": "to_csv", **shape,
+         **time_call(lambda: ranked.to_csv(index=False).encode("utf-8"), repeat)},
+    ]
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: str) -> None:
+    """Print median time ratios against an earlier results file."""
+    with open(baseline_path, "r", encoding="utf-8") as fh:
+        baseline = json.load(fh)
+
+    def key(r: Dict[str, Any]):
+        return (r["stage"], r["students"], r["modules"])
+
+    old = {key(r): r for r in baseline["results"]}
+    print(f"\nvs {baseline.get('commit') or baseline_path}:")
+    for r in current:
+        prev = old.get(key(r))
+        if prev:
+            ratio = r["median"] / prev["median"] if prev["median"] else float("inf")
+            print(f"  {r['stage']:<18} {r['students']:>7} students  x{ratio:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Cohort sizes for the GPA, rank and CSV stages")
+    parser.add_argument("--modules", type=int, default=40,
+                        help="Modules per synthetic frame")
+    parser.add_argument("--density", type=float, default=1.0,
+                        help="Fraction of student x module cells with a grade")
+    parser.add_argument("--parse-students", type=int, nargs="*", default=[1000],
+                        help="Students per synthetic sheet for the parse stage")
+    parser.add_argument("--parse-modules", type=int, default=4,
+                        help="Synthetic sheets (one per module) for the parse stage")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the parse stage")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", help="Results file (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = []
+    for students in args.parse_students:
+        results.append(bench_parse(students, args.parse_modules, args.workers, 1))
+        print(_format(results[-1]))
+    for students in args.scales:
+        for r in bench_frame_stages(students, args.modules, args.density, args.repeat):
+            results.append(r)
+            print(_format(r))
+
+    commit = _git_commit()
+    created = datetime.now(timezone.utc)
+    payload = {
+        "commit": commit,
+        "created": created.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(
+            RESULTS_DIR, f"{created:%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+        )
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+def _format(r: Dict[str, Any]) -> str:
+    return (
+        f"{r['stage']:<18} {r['students']:>7} students x {r['modules']:>3} modules  "
+        f"best {r['best'] * 1000:9.1f} ms  median {r['median'] * 1000:9.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
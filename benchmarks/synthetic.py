@@ -0,0 +1,213 @@
+"""
+Synthetic result-sheet PDFs for benchmarking.
+
+The sheets mimic the layout of the files in ``sampleData/``: a few header
+lines naming the module, then a ruled table with the columns
+No / Registration No / CA Marks / Grade / Status, repeated on every page.
+The PDFs are written by hand (Helvetica, lines and text only) so no PDF
+library is needed to generate them.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gpa_cal.grading import CREDITS, GP_MAP
+from gpa_cal.patterns import MODULE_PATTERN
+
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+ROW_HEIGHT = 16
+COLUMNS = ["No", "Registration No", "CA Marks", "Grade", "Status"]
+COLUMN_X = [40, 80, 220, 300, 360, 430]
+TABLE_TOP = 720
+HEADER_LINES = [
+    "Sri Lanka Institute of Information Technology",
+    "{module} - Synthetic Module",
+    "All - Institute All - Specialization All - Regular",
+    "Unofficial Final Grades (Official grades will be available through student profiles after the BOE)",
+    "Examination Type :- General Examination - 2025",
+]
+GRADES = list(GP_MAP)
+
+
+@dataclass
+class SheetSpec:
+    """Shape of one synthetic sheet."""
+
+    module: str = "IT2010"
+    students: int = 1000
+    rows_per_page: int = 40
+    noise_rate: float = 0.02
+    seed: int = 0
+    # Put the module code in the filename (otherwise only in the page text)
+    module_in_name: bool = True
+    # Grade summary / signature pages after the results (no table rows)
+    summary_pages: int = 0
+
+
+def reg_no(n: int) -> str:
+    """Registration number in the sheets' spaced format, e.g. ``IT 21 0001 23``."""
+    return f"IT {21 + (n // 1_000_000) % 5:02d} {(n // 100) % 10_000:04d} {n % 100:02d}"
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text(x: float, y: float, text: str, size: int = 9) -> str:
+    return f"BT /F1 {size} Tf {x:.1f} {y:.1f} Td ({_escape(text)}) Tj ET"
+
+
+def _page_stream(header: List[str], rows: List[List[str]]) -> bytes:
+    ops = []
+    y = PAGE_HEIGHT - 50
+    for line in header:
+        ops.append(_text(40, y, line, size=10))
+        y -= 14
+
+    table = [COLUMNS] + rows
+    bottom = TABLE_TOP - ROW_HEIGHT * len(table)
+    ops.append("0.5 w")
+    for i in range(len(table) + 1):
+        ly = TABLE_TOP - ROW_HEIGHT * i
+        ops.append(f"{COLUMN_X[0]} {ly} m {COLUMN_X[-1]} {ly} l S")
+    for x in COLUMN_X:
+        ops.append(f"{x} {TABLE_TOP} m {x} {bottom} l S")
+    for i, row in enumerate(table):
+        ty = TABLE_TOP - ROW_HEIGHT * (i + 1) + 5
+        for x, cell in zip(COLUMN_X, row):
+            if cell:
+                ops.append(_text(x + 3, ty, cell))
+    return "\n".join(ops).encode("latin-1")
+
+
+def _summary_stream(rows: List[List[str]]) -> bytes:
+    """A page of grade counts and signature lines, without a results table."""
+    counts: Dict[str, int] = {}
+    for row in rows:
+        if row[3] in GP_MAP:
+            counts[row[3]] = counts.get(row[3], 0) + 1
+    lines = ["Grade distribution"]
+    lines += [f"{grade}: {counts.get(grade, 0)}" for grade in GRADES]
+    lines += ["", "Name of Examiner :-", "Signature :-........................", "Date :-"]
+    ops = [_text(40, PAGE_HEIGHT - 50 - 14 * i, line, size=10) for i, line in enumerate(lines) if line]
+    return "\n".join(ops).encode("latin-1")
+
+
+def build_pdf(pages: List[bytes]) -> bytes:
+    """Assemble content streams into a minimal PDF document."""
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for stream in pages:
+        content_id = len(objects) + 2
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, content_id - 1)
+        )
+        kids.append(b"%d 0 R" % content_id)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(kids), len(kids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref,
+    )
+    return bytes(out)
+
+
+def sheet_rows(spec: SheetSpec) -> List[List[str]]:
+    """Table rows (without the header row) for a sheet, noise included."""
+    rng = random.Random(f"{spec.seed}-{spec.module}")
+    rows = []
+    for n in range(spec.students):
+        grade = rng.choice(GRADES)
+        ca = f"{rng.uniform(0, 100):.1f}"
+        status = "Fail" if GP_MAP[grade] < 1.0 else "Pass"
+        rows.append([str(n + 1), reg_no(n), ca, grade, status])
+        if rng.random() < spec.noise_rate:
+            # Rows the parser has to reject or fall back on
+            rows.append(rng.choice([
+                ["", "", "", "", ""],
+                ["", "Absent", "", "AB", ""],
+                [str(n + 1), "Withheld", "", "", "WH"],
+            ]))
+    return rows
+
+
+def make_sheet(spec: SheetSpec) -> Tuple[str, bytes]:
+    """(filename, bytes) for one synthetic sheet."""
+    header = [line.format(module=spec.module) for line in HEADER_LINES]
+    rows = sheet_rows(spec)
+    pages = [
+        _page_stream(header, rows[i:i + spec.rows_per_page - 1])
+        for i in range(0, max(len(rows), 1), spec.rows_per_page - 1)
+    ]
+    pages += [_summary_stream(rows)] * spec.summary_pages
+    name = f"{spec.module}_synthetic.pdf" if spec.module_in_name else "synthetic.pdf"
+    return name, build_pdf(pages)
+
+
+def make_sheets(
+    students: int,
+    modules: int,
+    rows_per_page: int = 40,
+    noise_rate: float = 0.02,
+    seed: int = 0,
+) -> List[Tuple[str, bytes]]:
+    """One synthetic sheet per module (IT modules, which the parser
+    recognises) for the same cohort."""
+    return [
+        make_sheet(SheetSpec(
+            module=module,
+            students=students,
+            rows_per_page=rows_per_page,
+            noise_rate=noise_rate,
+            seed=seed,
+        ))
+        for module in [m for m in sorted(CREDITS) if MODULE_PATTERN.fullmatch(m)][:modules]
+    ]
+
+
+def make_wide_frame(
+    students: int,
+    modules: int,
+    density: float = 1.0,
+    seed: int = 0,
+    module_names: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Wide student x module frame shaped like the output of the parser (before
+    the GPA column), for benchmarking the stages after PDF extraction.
+    """
+    rng = np.random.default_rng(seed)
+    module_names = module_names or sorted(CREDITS)[:modules]
+    grades = np.array(GRADES, dtype=object)[rng.integers(0, len(GRADES), (students, len(module_names)))]
+    grades[rng.random(grades.shape) >= density] = None
+    data: Dict[str, object] = {
+        "Registration No": [reg_no(n).replace(" ", "") for n in range(students)]
+    }
+    for j, module in enumerate(module_names):
+        data[module] = grades[:, j]
+    return pd.DataFrame(data)
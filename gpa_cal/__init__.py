@@ -0,0 +1,47 @@
+from .backends import (
+    DEFAULT_BACKEND,
+    SheetDocument,
+    UnsupportedSheet,
+    backend_names,
+    register_backend,
+)
+from .cache import ParseCache, default_cache
+from .dataset import ResultDataset
+from .downsample import CHART_POINTS, lttb, rank_curve, sorted_gpa_curve
+from .grading import CREDITS, GP_MAP, compute_gpa, student_gpa
+from .histogram import GpaHistogram
+from .instrumentation import Profile
+from .layout import LayoutTemplate, clear_templates
+from .leaderboard import Leaderboard
+from .longform import (
+    GradeBuffer,
+    long_gpa,
+    parse_result_long,
+    parse_result_stream,
+    pivot_wide,
+)
+from .lookup import StudentIndex, normalize_reg_no
+from .parsing import (
+    GRADE_PATTERN,
+    MODULE_PATTERN,
+    PARSER_VERSION,
+    REG_PATTERN,
+    build_grade_store,
+    iter_result_rows,
+    iter_sheet_rows,
+    merge_file_results,
+    parse_cache_key,
+    parse_file_results,
+    parse_pdf,
+    parse_result_paths,
+    parse_result_pdfs,
+)
+from .ranking import (
+    RankIndex,
+    Ranks,
+    add_ranks,
+    compute_ranks,
+    join_ranks,
+    rank_table,
+)
+from .store import GRADE_VOCAB, GradeStore
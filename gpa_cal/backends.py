@@ -0,0 +1,245 @@
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple, Type
+
+import pdfplumber
+from PyPDF2.errors import PdfReadError
+
+from .instrumentation import Profile, maybe_count, maybe_timer
+from .layout import (
+    LayoutTemplate,
+    get_template,
+    is_known,
+    layout_fingerprint,
+    may_have_rows,
+    remember_template,
+    table_grid,
+    template_table,
+)
+from .rows import TableRow, parse_rows
+from .textlayer import read_text_pages, text_page_rows
+
+
+class UnsupportedSheet(Exception):
+    """Raised by a backend that cannot read a sheet; the default backend is
+    used for it instead."""
+
+
+class SheetDocument:
+    """
+    One sheet opened by an extraction backend.
+
+    Backends subclass this and are registered by name with
+    :func:`register_backend`. Pages are addressed by index: the parser asks
+    for ``page_text`` (only while it still looks for the module code), then
+    ``page_rows``, after which the page may be released. When ``pages`` is
+    given only those page indexes are asked for, so backends that read
+    eagerly can skip the rest.
+    """
+
+    name = ""
+
+    def __init__(
+        self,
+        filename: str,
+        stream: BinaryIO,
+        profile: Optional[Profile] = None,
+        pages: Optional[range] = None,
+    ):
+        self.filename = filename
+        self.profile = profile
+        self.pages = pages
+
+    def __enter__(self) -> "SheetDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def page_indexes(self) -> range:
+        """Indexes of the pages to read: all, or those in ``pages``."""
+        if self.pages is None:
+            return range(len(self))
+        return range(len(self))[self.pages.start:self.pages.stop]
+
+    def page_text(self, index: int) -> str:
+        raise NotImplementedError
+
+    def page_rows(self, index: int) -> List[TableRow]:
+        """Table rows of a page below the header row; [] without a table."""
+        raise NotImplementedError
+
+    def row_widths(self, index: int) -> Set[int]:
+        """Numbers of cells of the rows on a page."""
+        return {len(row) for row in self.page_rows(index)}
+
+    def close(self) -> None:
+        pass
+
+
+class PdfplumberDocument(SheetDocument):
+    """Tables through pdfplumber's layout analysis (learned layout templates
+    first, ``extract_table`` otherwise)."""
+
+    name = "pdfplumber"
+
+    def __init__(
+        self,
+        filename: str,
+        stream: BinaryIO,
+        profile: Optional[Profile] = None,
+        pages: Optional[range] = None,
+    ):
+        super().__init__(filename, stream, profile, pages)
+        with maybe_timer(profile, "open", file=filename):
+            stream.seek(0)
+            self.pdf = pdfplumber.open(stream)
+
+    def __len__(self) -> int:
+        return len(self.pdf.pages)
+
+    def page_text(self, index: int) -> str:
+        # The old text pass + table pass analysed these pages twice
+        maybe_count(self.profile, "page_analyses_saved")
+        with maybe_timer(self.profile, "extract_text", file=self.filename, page=index + 1):
+            return self.pdf.pages[index].extract_text() or ""
+
+    def page_rows(self, index: int) -> List[TableRow]:
+        page = self.pdf.pages[index]
+        with maybe_timer(self.profile, "prefilter", file=self.filename, page=index + 1):
+            wanted = may_have_rows(page.chars)
+        if not wanted:
+            # Cover, signature or summary page: nothing to extract
+            maybe_count(self.profile, "pages_skipped", file=self.filename)
+            page.close()
+            return []
+        table = _extract_table(page, self.profile, self.filename, index + 1)
+        page.close()
+        return table[1:] if table else []
+
+    def close(self) -> None:
+        self.pdf.close()
+
+
+def _extract_table(
+    page, profile: Optional[Profile], filename: str, page_no: int
+) -> Optional[List[TableRow]]:
+    """
+    The results table of a page.
+
+    Pages whose ruling matches a learned layout template are read straight
+    from their glyphs. Other pages go through ``extract_table``; the first
+    such page of a new layout is also read with the candidate template, and
+    the template is kept only if both give the same rows. Pages ruled
+    unlike a template (e.g. with a merged row) always go through
+    ``extract_table`` and are not used to learn one.
+    """
+    grid = table_grid(page)
+    fingerprint = layout_fingerprint(page, grid) if grid else None
+    template = get_template(fingerprint) if fingerprint else None
+    if template is not None:
+        with maybe_timer(profile, "template_table", file=filename, page=page_no):
+            table = template_table(page, grid)
+        if table and tuple(table[0]) == template.header:
+            maybe_count(profile, "template_pages")
+            return table
+
+    with maybe_timer(profile, "extract_table", file=filename, page=page_no):
+        table = page.extract_table()
+
+    if fingerprint and not is_known(fingerprint) and table and len(table) > 1:
+        expected = parse_rows(table[1:])
+        if expected:
+            candidate = template_table(page, grid)
+            if candidate is not None:
+                got = parse_rows(candidate[1:])
+                remember_template(
+                    fingerprint,
+                    LayoutTemplate(grid.columns, tuple(candidate[0]))
+                    if candidate and got == expected
+                    else None,
+                )
+    return table
+
+
+class TextLayerDocument(SheetDocument):
+    """
+    Rows read from the PDF text layer with PyPDF2 and a line regex; no
+    layout analysis. Only plainly tabulated sheets qualify: opening any
+    other sheet raises :class:`UnsupportedSheet`.
+    """
+
+    name = "text"
+
+    def __init__(
+        self,
+        filename: str,
+        stream: BinaryIO,
+        profile: Optional[Profile] = None,
+        pages: Optional[range] = None,
+    ):
+        super().__init__(filename, stream, profile, pages)
+        with maybe_timer(profile, "text_extract", file=filename):
+            stream.seek(0)
+            try:
+                self.page_count, self.texts = read_text_pages(stream, pages)
+            except (PdfReadError, KeyError, ValueError) as exc:
+                raise UnsupportedSheet(str(exc)) from exc
+        self.rows: Dict[int, List[TableRow]] = {}
+        for index, text in self.texts.items():
+            rows = text_page_rows(text)
+            if rows is None:
+                raise UnsupportedSheet("results lines the line parser cannot read")
+            self.rows[index] = rows
+        if not any(self.rows.values()):
+            raise UnsupportedSheet("no results lines in the text layer")
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def page_text(self, index: int) -> str:
+        return self.texts[index]
+
+    def page_rows(self, index: int) -> List[TableRow]:
+        return self.rows[index]
+
+
+# name -> (document class, tried by backend="auto")
+_BACKENDS: Dict[str, Tuple[Type[SheetDocument], bool]] = {}
+
+# Reference backend: used when a sheet is unsupported elsewhere, and the one
+# "auto" candidates are checked against
+DEFAULT_BACKEND = "pdfplumber"
+
+
+def register_backend(name: str, document: Type[SheetDocument], auto: bool = False) -> None:
+    """
+    Make ``document`` available as ``backend=name``. With ``auto``, the
+    ``"auto"`` backend tries it (in registration order) before the default,
+    keeping it for a sheet only if it agrees with the default on sample
+    pages.
+    """
+    _BACKENDS[name] = (document, auto)
+
+
+def get_backend(name: str) -> Type[SheetDocument]:
+    try:
+        return _BACKENDS[name][0]
+    except KeyError:
+        raise ValueError(
+            f"unknown backend {name!r}; expected one of {backend_names()}"
+        ) from None
+
+
+def backend_names() -> Tuple[str, ...]:
+    """Every accepted ``backend`` value, ``"auto"`` first."""
+    return ("auto", *_BACKENDS)
+
+
+def auto_backends() -> List[str]:
+    return [name for name, (_, auto) in _BACKENDS.items() if auto]
+
+
+register_backend(DEFAULT_BACKEND, PdfplumberDocument)
+register_backend("text", TextLayerDocument, auto=True)
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gpa_cal")
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+
+# (module code, {registration no: grade}) as stored in the cache
+CachedResult = Tuple[Optional[str], Any]
+
+
+def content_key(file_bytes: bytes, *parts: str) -> str:
+    """BLAKE2 digest of ``file_bytes`` plus any extra key ``parts``."""
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    h.update(file_bytes)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    Two-tier cache of per-file parse results.
+
+    Entries live in an in-memory LRU and, when ``directory`` is set, as JSON
+    files on disk. The disk tier is trimmed to ``max_disk_bytes`` by removing
+    the least recently used files first. The directory is scanned once, on
+    first use; after that sizes and recency are tracked in memory, so a
+    write does not re-walk the cache. Files written by other processes are
+    picked up on the next scan.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = DEFAULT_CACHE_DIR,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+    ):
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Disk entries, least recently used first: path -> size in bytes
+        self._disk: "Optional[OrderedDict[str, int]]" = None
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return result
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: CachedResult) -> None:
+        with self._lock:
+            self._remember(key, result)
+        self._write_disk(key, result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        for path, _, _ in self._disk_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._disk = None
+            self._disk_bytes = 0
+
+    # -- memory tier --
+
+    def _remember(self, key: str, result: CachedResult) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    # -- disk tier --
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[CachedResult]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                payload = json.load(fh)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if self._disk is not None and path in self._disk:
+                self._disk.move_to_end(path)
+        return payload["module"], payload["grades"]
+
+    def _write_disk(self, key: str, result: CachedResult) -> None:
+        if not self.directory:
+            return
+        module_code, grades = result
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump({"module": module_code, "grades": grades}, fh)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError:
+            # The disk tier is best effort; the memory tier still holds the entry
+            return
+        with self._lock:
+            index = self._disk_index()
+            self._disk_bytes += size - index.pop(path, 0)
+            index[path] = size
+            self._evict_disk()
+
+    def _disk_entries(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, st.st_mtime, st.st_size))
+        return entries
+
+    def _disk_index(self) -> "OrderedDict[str, int]":
+        """The disk entries by recency, from one directory scan (lock held)."""
+        if self._disk is None:
+            entries = sorted(self._disk_entries(), key=lambda e: e[1])
+            self._disk = OrderedDict((path, size) for path, _, size in entries)
+            self._disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def _evict_disk(self) -> None:
+        """Remove least recently used files until under the limit (lock held)."""
+        index = self._disk_index()
+        while self._disk_bytes > self.max_disk_bytes and index:
+            path, size = index.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                # Already gone; it no longer counts either way
+                pass
+
+
+_default_cache: Optional[ParseCache] = None
+
+
+def default_cache() -> ParseCache:
+    """Process-wide cache; ``GPA_CAL_CACHE_DIR`` overrides the disk location
+    and an empty value disables the disk tier."""
+    global _default_cache
+    if _default_cache is None:
+        directory = os.environ.get("GPA_CAL_CACHE_DIR", DEFAULT_CACHE_DIR) or None
+        _default_cache = ParseCache(directory=directory)
+    return _default_cache
+
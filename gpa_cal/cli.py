@@ -0,0 +1,160 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .cache import ParseCache
+from .instrumentation import Profile
+from .backends import backend_names
+from .parsing import parse_result_paths
+from .ranking import add_ranks
+
+
+def collect_pdfs(sources: Iterable[str]) -> List[str]:
+    """
+    Expand directories (searched recursively), glob patterns and plain file
+    paths into a sorted, de-duplicated list of PDF paths.
+    """
+    found = set()
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, names in os.walk(source):
+                found.update(
+                    os.path.join(root, name)
+                    for name in names
+                    if name.lower().endswith(".pdf")
+                )
+        elif glob.has_magic(source):
+            found.update(
+                p for p in glob.glob(source, recursive=True)
+                if os.path.isfile(p) and p.lower().endswith(".pdf")
+            )
+        elif os.path.isfile(source):
+            found.add(source)
+        else:
+            raise FileNotFoundError(source)
+    return sorted(found)
+
+
+def write_results(df: pd.DataFrame, output: str, fmt: Optional[str] = None) -> None:
+    """Write results as CSV or Parquet (chosen by ``fmt`` or the extension)."""
+    if fmt is None:
+        fmt = "parquet" if output.lower().endswith(".parquet") else "csv"
+    if fmt == "parquet":
+        try:
+            df.to_parquet(output, index=False)
+        except ImportError as exc:
+            raise SystemExit(
+                "Parquet output needs pyarrow or fastparquet installed"
+            ) from exc
+    else:
+        df.to_csv(output, index=False)
+
+
+def _format_summary(counters: Dict[str, int], students: int, elapsed: float) -> str:
+    elapsed = max(elapsed, 1e-9)
+    pages = counters.get("pages", 0)
+    cached = counters.get("files_cached", 0)
+    skipped = counters.get("pages_skipped", 0)
+    failed = counters.get("files_failed", 0)
+    return (
+        f"Parsed {counters.get('files', 0)} file(s)"
+        + (f" ({cached} from cache)" if cached else "")
+        + (f" ({failed} failed)" if failed else "")
+        + f", {pages} page(s)"
+        + (f" ({skipped} without results skipped)" if skipped else "")
+        + ", "
+        f"{students} student(s) in {elapsed:.2f}s "
+        f"({pages / elapsed:.1f} pages/sec, {students / elapsed:.1f} students/sec)"
+    )
+
+
+def batch(args: argparse.Namespace) -> int:
+    try:
+        paths = collect_pdfs(args.sources)
+    except FileNotFoundError as exc:
+        print(f"gpa-cal: no such file or directory: {exc}", file=sys.stderr)
+        return 2
+    if not paths:
+        print("No PDF files found.", file=sys.stderr)
+        return 1
+
+    profile = Profile()
+    start = time.perf_counter()
+    cache = ParseCache(directory=args.cache_dir) if args.cache_dir else None
+    failed: Dict[int, str] = {}
+    df = parse_result_paths(
+        paths, workers=args.workers, cache=cache, profile=profile,
+        backend=args.backend, failed=failed,
+    )
+    df = add_ranks(df, profile, inplace=True)
+    with profile.timer("write"):
+        write_results(df, args.output, args.format)
+    elapsed = time.perf_counter() - start
+
+    print(_format_summary(profile.counters, len(df), elapsed), file=sys.stderr)
+    for i, error in sorted(failed.items()):
+        print(f"gpa-cal: failed to parse {paths[i]}: {error}", file=sys.stderr)
+    if args.profile_json:
+        report = profile.to_dict()
+        report["elapsed"] = elapsed
+        report["failed"] = {paths[i]: error for i, error in failed.items()}
+        with open(args.profile_json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gpa-cal",
+        description="Compute student GPAs and ranks from PDF result sheets.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_batch = sub.add_parser(
+        "batch", help="Parse result PDFs from disk and write GPAs to a file"
+    )
+    p_batch.add_argument(
+        "sources", nargs="+", help="PDF files, directories or glob patterns"
+    )
+    p_batch.add_argument(
+        "-o", "--output", default="student_results_gpa.csv",
+        help="Output file (.csv or .parquet)",
+    )
+    p_batch.add_argument(
+        "--format", choices=["csv", "parquet"],
+        help="Output format (default: from the output extension)",
+    )
+    p_batch.add_argument(
+        "-j", "--workers", type=int, default=0,
+        help="Worker processes (default: one per CPU, 1 = serial)",
+    )
+    p_batch.add_argument(
+        "--backend", choices=backend_names(), default="auto",
+        help="Extraction backend (default: text layer when it checks out, else pdfplumber)",
+    )
+    p_batch.add_argument(
+        "--cache-dir", metavar="DIR",
+        help="Reuse parse results of unchanged PDFs from this cache directory",
+    )
+    p_batch.add_argument(
+        "--profile-json", metavar="PATH",
+        help="Write per-stage, per-file and per-page timings as JSON",
+    )
+    p_batch.set_defaults(func=batch)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
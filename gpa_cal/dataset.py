@@ -0,0 +1,181 @@
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .cache import ParseCache
+from .histogram import GpaHistogram
+from .instrumentation import Profile
+from .parsing import FileResult, parse_file_results
+from .ranking import RankIndex, add_ranks
+from .store import GradeStore
+
+
+class ResultDataset:
+    """
+    Results kept per sheet so single sheets can be added, replaced or removed.
+
+    Each sheet's parse result is stored on its own. Changing one sheet only
+    parses that file, then recomputes the affected students' effective grades
+    (later sheets win, as in :func:`parse_result_pdfs`) and GPAs. A
+    :class:`RankIndex` answers rank queries without re-ranking the cohort,
+    and a :class:`GpaHistogram` (bins of ``bin_width``) keeps the GPA
+    distribution.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ParseCache] = None,
+        workers: Optional[int] = 1,
+        profile: Optional[Profile] = None,
+        bin_width: float = 0.1,
+    ):
+        self.cache = cache
+        self.workers = workers
+        self.profile = profile
+        # Sheets in precedence order (later wins), keyed by sheet id
+        self._sheets: Dict[str, FileResult] = {}
+        # Effective {module: grade} per raw registration number
+        self._students: Dict[str, Dict[str, Optional[str]]] = {}
+        self._ranks = RankIndex()
+        self.histogram = GpaHistogram(bin_width)
+        # Bumped on every change; handy as a cache key for derived views
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def __contains__(self, sheet_id: str) -> bool:
+        return sheet_id in self._sheets
+
+    @property
+    def sheet_ids(self) -> List[str]:
+        return list(self._sheets)
+
+    # -- sheet updates --
+
+    def add_sheets(
+        self,
+        files: Iterable[Tuple[str, bytes]],
+        sheet_ids: Optional[Iterable[str]] = None,
+    ) -> Set[str]:
+        """
+        Add or replace several sheets; new sheets parse in parallel.
+
+        A sheet id defaults to the filename. Re-using an id replaces that
+        sheet in place, keeping its precedence. Returns the affected
+        registration numbers.
+        """
+        files = list(files)
+        ids = list(sheet_ids) if sheet_ids is not None else [name for name, _ in files]
+        return self._set_sheets(list(zip(ids, self._parse(files))))
+
+    def add_sheet(
+        self, filename: str, file_bytes: bytes, sheet_id: Optional[str] = None
+    ) -> Set[str]:
+        return self.add_sheets(
+            [(filename, file_bytes)], None if sheet_id is None else [sheet_id]
+        )
+
+    def remove_sheet(self, sheet_id: str) -> Set[str]:
+        """Drop a sheet; returns the affected registration numbers."""
+        old = self._sheets.pop(sheet_id)
+        return self._refresh([old])
+
+    def _parse(self, files: List[Tuple[str, bytes]]) -> List[FileResult]:
+        return parse_file_results(files, self.workers, self.cache, self.profile)
+
+    def _set_sheets(self, sheets: List[Tuple[str, FileResult]]) -> Set[str]:
+        """Store several sheets, then refresh everything they touch once."""
+        changed: List[FileResult] = []
+        for sheet_id, result in sheets:
+            old = self._sheets.get(sheet_id)
+            if old is not None:
+                changed.append(old)
+            self._sheets[sheet_id] = result
+            changed.append(result)
+        return self._refresh(changed)
+
+    # -- incremental recomputation --
+
+    def _refresh(self, changed: List[FileResult]) -> Set[str]:
+        """
+        Recompute the effective grades and GPAs of every student in the
+        ``changed`` sheet results (old and new versions), for the modules
+        those sheets cover, in one pass over the current sheets.
+        """
+        modules: Set[str] = set()
+        affected: Set[str] = set()
+        for module_code, grades in changed:
+            if module_code and grades:
+                modules.add(module_code)
+                affected.update(grades)
+        if not affected:
+            return affected
+
+        # Replay the sheets of those modules in order, so later sheets win
+        cells: Dict[str, Dict[str, Optional[str]]] = {reg_no: {} for reg_no in affected}
+        for module_code, grades in self._sheets.values():
+            if module_code in modules and grades:
+                for reg_no, grade in grades.items():
+                    student = cells.get(reg_no)
+                    if student is not None:
+                        student[module_code] = grade
+
+        for reg_no, student in cells.items():
+            mods = self._students.pop(reg_no, {})
+            for mod in modules:
+                mods.pop(mod, None)
+            mods.update(student)
+            if mods:
+                self._students[reg_no] = mods
+
+        store = self._store(affected)
+        gpas = dict(zip(store.students, store.gpa().tolist()))
+        for reg_no in affected:
+            gpa = gpas.get(reg_no)
+            self._set_gpa(reg_no, None if gpa is None or math.isnan(gpa) else gpa)
+
+        self.version += 1
+        return affected
+
+    def _store(self, reg_nos: Iterable[str]) -> GradeStore:
+        """Vectorised :class:`GradeStore` of the given students' effective grades."""
+        by_module: Dict[str, Dict[str, Optional[str]]] = {}
+        for reg_no in reg_nos:
+            for mod, grade in self._students.get(reg_no, {}).items():
+                by_module.setdefault(mod, {})[reg_no] = grade
+        return GradeStore.from_results(sorted(by_module.items()))
+
+    def _set_gpa(self, reg_no: str, gpa: Optional[float]) -> None:
+        self.histogram.update(self._ranks.gpa(reg_no), gpa)
+        if gpa is None:
+            self._ranks.discard(reg_no)
+        else:
+            self._ranks.set(reg_no, gpa)
+
+    # -- queries --
+
+    @property
+    def ranks(self) -> RankIndex:
+        """Rank index over the current GPAs (read-only use)."""
+        return self._ranks
+
+    def gpa(self, reg_no: str) -> Optional[float]:
+        return self._ranks.gpa(reg_no)
+
+    def rank(self, reg_no: str) -> Optional[int]:
+        """Rank (1 = best, ties share the best rank) of a student."""
+        return self._ranks.rank(reg_no)
+
+    def percentile(self, reg_no: str) -> Optional[float]:
+        return self._ranks.percentile(reg_no)
+
+    def to_frame(self, ranked: bool = True) -> pd.DataFrame:
+        """
+        Wide student x module frame, identical to ``parse_result_pdfs`` (and
+        ``add_ranks`` when ``ranked``) over the current sheets in order.
+        """
+        # Built the way parse_result_pdfs builds it, from the effective grades
+        df = self._store(self._students).to_frame()
+        return add_ranks(df, self.profile, inplace=True) if ranked else df
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+# Points sent to the browser per chart by default
+CHART_POINTS = 2000
+
+
+def lttb(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """
+    Indexes of at most ``budget`` points of the series ``(x, y)`` chosen by
+    Largest-Triangle-Three-Buckets: the first and last points, plus from
+    each of ``budget - 2`` equal buckets the point forming the largest
+    triangle with the previous pick and the next bucket's average. Keeps
+    the visual shape (steps, extremes) of the full series.
+    """
+    n = len(x)
+    if budget >= n:
+        return np.arange(n)
+    if budget < 3:
+        raise ValueError("budget must be at least 3 points")
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    # Middle points 1 .. n-2 split into budget - 2 non-empty buckets
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.intp)
+    picked = np.empty(budget, dtype=np.intp)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+
+def rank_curve(df: pd.DataFrame, budget: int = CHART_POINTS) -> pd.DataFrame:
+    """
+    Rank and GPA of every student in rank order, reduced to ``budget``
+    points, for the GPA vs Rank chart. Only the two columns are read; as
+    rank only grows as GPA falls, sorting each column on its own gives the
+    rank order without sorting the frame.
+    """
+    rank = np.sort(df["Rank"].to_numpy())
+    gpa = np.sort(df["GPA"].to_numpy(dtype="float64"))[::-1]
+    keep = lttb(rank, gpa, budget)
+    return pd.DataFrame({"Rank": rank[keep], "GPA": gpa[keep]})
+
+
+def sorted_gpa_curve(gpa: pd.Series, budget: int = CHART_POINTS) -> pd.Series:
+    """
+    GPAs sorted best first, indexed by position, reduced to ``budget``
+    points for the sorted-GPA line chart.
+    """
+    values = np.sort(gpa.to_numpy(dtype="float64"))[::-1]
+    keep = lttb(np.arange(len(values)), values, budget)
+    return pd.Series(values[keep], index=keep, name="GPA")
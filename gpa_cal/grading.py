@@ -0,0 +1,228 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Grade -> grade point mapping
+GP_MAP: Dict[str, float] = {
+    "A+": 4.0,
+    "A": 4.0,
+    "A-": 3.7,
+    "B+": 3.3,
+    "B": 3.0,
+    "B-": 2.7,
+    "C+": 2.3,
+    "C": 2.0,
+    "C-": 1.7,
+    "D+": 1.3,
+    "D": 1.0,
+    "E": 0.0,
+    "F": 0.0,
+}
+
+# Default module credits (can be adjusted here)
+CREDITS: Dict[str, int] = {
+
+    # ------------------------
+    # Year 1 – Common IT
+    # ------------------------
+    "IT1010": 4,  # Introduction to Programming
+    "IT1020": 4,  # Introduction to Computer Systems
+    "IT1030": 4,  # Mathematics for Computing
+    "IT1040": 3,  # Communication Skills
+    "IT1050": 2,  # Object Oriented Concepts
+    "IT1060": 3,  # Software Process Modeling
+    "IT1080": 3,  # English for Academic Purposes
+    "IT1090": 4,  # Information Systems and Data Modeling
+    "IT1100": 4,  # Internet and Web Technologies
+
+    # ------------------------
+    # Year 2 – Core IT
+    # ------------------------
+    "IT2020": 4,  # Software Engineering
+    "IT2030": 4,  # Object Oriented Programming
+    "IT2040": 4,  # Database Management Systems
+    "IT2050": 4,  # Computer Networks
+    "IT2060": 4,  # Operating Systems & System Administration
+    "IT2070": 4,  # Data Structures and Algorithms
+    "IT2080": 4,  # IT Project
+    "IT2090": 2,  # Professional Skills
+    "IT2100": 1,  # Employability Skills Development – Seminar
+    "IT2110": 3,  # Probability and Statistics
+    "IT2010": 4,  # mobile Application Development
+
+    # ------------------------
+    # Year 3 – IT / SE
+    # ------------------------
+    "IT3010": 4,  # Network Design and Management
+    "IT3020": 4,  # Database Systems
+    "IT3030": 4,  # Programming Applications & Frameworks
+    "IT3040": 4,  # IT Project Management
+    "IT3050": 1,  # Employability Skills Development – Seminar (NGPA)
+    "IT3060": 4,  # Human Computer Interaction
+    "IT3070": 4,  # Information Assurance & Security
+    "IT3080": 4,  # Data Science & Analytics
+    "IT3090": 3,  # Business Management for IT
+    "IT3110": 8,  # Industry Placement
+
+    # ------------------------
+    # Year 4 – IT
+    # ------------------------
+    "IT4010": 16, # Research Project
+    "IT4070": 2,  # Preparation for the Professional World
+    "IT4020": 4,  # Modern Topics in IT
+    "IT4030": 4,  # Internet of Things
+    "IT4040": 4,  # Database Administration
+    "IT4050": 4,  # Innovation Management & Entrepreneurship
+    "IT4060": 4,  # Machine Learning
+    "IT4090": 4,  # Cloud Computing
+    "IT4100": 4,  # Software Quality Assurance
+    "IT4110": 4,  # Computer Systems & Network Administration
+    "IT4120": 4,  # Knowledge Management
+    "IT4130": 4,  # Image Understanding & Processing
+
+    # ------------------------
+    # Software Engineering (SE)
+    # ------------------------
+    "SE1010": 4,  # Software Engineering
+    "SE2010": 4,  # Object Oriented Programming
+    "SE2020": 4,  # Web and Mobile Technologies
+    "SE3010": 4,  # Software Engineering Process & Quality Management
+    "SE3020": 4,  # Distributed Systems
+    "SE3030": 4,  # Software Architecture
+    "SE3040": 4,  # Application Frameworks
+    "SE3050": 3,  # User Experience Engineering
+    "SE3060": 4,  # Database Systems
+    "SE3070": 4,  # Case Studies in Software Engineering
+    "SE3080": 3,  # Software Project Management
+    "SE4010": 4,  # Current Trends in Software Engineering
+    "SE4020": 4,  # Mobile Application Design & Development
+    "SE4030": 4,  # Secure Software Development
+    "SE4040": 4,  # Enterprise Application Development
+    "SE4050": 4,  # Deep Learning
+    "SE4060": 4,  # Parallel Computing
+
+    # ------------------------
+    # Information Engineering (IE)
+    # ------------------------
+    "IE1004": 4,  # Computational Thinking
+    "IE1014": 3,  # Engineering Mathematics I
+    "IE1024": 3,  # Computer Organization & Architecture
+    "IE1034": 3,  # Engineering Mathematics II
+    "IE1044": 3,  # Digital Electronics
+    "IE2004": 3,  # Computer Networks
+    "IE2024": 3,  # Probability and Statistics
+    "IE2034": 3,  # Analog Electronics
+    "IE2044": 3,  # System Modelling & Prototyping
+    "IE2064": 4,  # Advanced Computer Organization & Architecture
+    "IE2074": 3,  # Control Theory
+    "IE2084": 3,  # Communication Technologies
+}
+
+
+def _grade_to_gp(grade: Optional[str]) -> Optional[float]:
+    if not isinstance(grade, str):
+        return None
+    g = grade.strip().upper()
+    return GP_MAP.get(g)
+
+
+def student_gpa(grades: Dict[str, Optional[str]]) -> Optional[float]:
+    """
+    GPA of one student from their {module: grade} cells.
+
+    Modules are summed in sorted order, the same order as the columns of the
+    wide frame, so the result matches :func:`compute_gpa` exactly.
+    """
+    total_points = 0.0
+    total_credits = 0.0
+    for mod in sorted(grades):
+        gp = _grade_to_gp(grades[mod])
+        if gp is not None:
+            cr = CREDITS.get(mod, 1)
+            total_points += gp * cr
+            total_credits += cr
+
+    if total_credits > 0:
+        return round(total_points / total_credits, 2)
+    return None
+
+
+def grade_points_matrix(grades: pd.DataFrame) -> np.ndarray:
+    """
+    Map a block of grade cells to a float matrix of grade points.
+
+    Each distinct cell value is looked up in ``GP_MAP`` once; cells that are
+    missing or not a known grade become NaN.
+    """
+    codes, uniques = pd.factorize(grades.to_numpy(dtype=object).ravel())
+    lut = np.array(
+        [np.nan if (gp := _grade_to_gp(u)) is None else gp for u in uniques] + [np.nan],
+        dtype=np.float64,
+    )
+    # factorize marks missing values with -1, which indexes the trailing NaN
+    return lut[codes].reshape(grades.shape)
+
+
+def credit_vector(modules: List[str]) -> np.ndarray:
+    return np.array([CREDITS.get(mod, 1) for mod in modules], dtype=np.float64)
+
+
+def compute_gpa(df: pd.DataFrame) -> pd.DataFrame:
+    """Add a GPA column to a wide student x module dataframe."""
+    module_cols = [c for c in df.columns if c != "Registration No"]
+    gp = grade_points_matrix(df[module_cols])
+    credits = credit_vector(module_cols)
+    graded = ~np.isnan(gp)
+
+    # Accumulate module by module (in column order) rather than with a
+    # row-wise sum, so the floating point result matches adding the cells
+    # one at a time.
+    total_points = np.zeros(len(df), dtype=np.float64)
+    total_credits = np.zeros(len(df), dtype=np.float64)
+    for j in range(len(module_cols)):
+        mask = graded[:, j]
+        total_points += np.where(mask, gp[:, j] * credits[j], 0.0)
+        total_credits += np.where(mask, credits[j], 0.0)
+
+    df["GPA"] = gpa_from_totals(total_points, total_credits)
+    return df
+
+
+def weighted_gpa(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    gp: np.ndarray,
+    credits: np.ndarray,
+    n_students: int,
+) -> np.ndarray:
+    """
+    GPAs from graded cells given as parallel (student row, module column,
+    grade point) arrays, e.g. a sparse or long-format grade table.
+
+    Each student has at most one cell per module, so adding module by module
+    keeps the per-student addition order of the wide calculation.
+    """
+    total_points = np.zeros(n_students, dtype=np.float64)
+    total_credits = np.zeros(n_students, dtype=np.float64)
+    order = np.argsort(cols, kind="stable")
+    bounds = np.searchsorted(cols[order], np.arange(len(credits) + 1))
+    for j in range(len(credits)):
+        sel = order[bounds[j]:bounds[j + 1]]
+        total_points[rows[sel]] += gp[sel] * credits[j]
+        total_credits[rows[sel]] += credits[j]
+    return gpa_from_totals(total_points, total_credits)
+
+
+def gpa_from_totals(total_points: np.ndarray, total_credits: np.ndarray) -> np.ndarray:
+    """Rounded GPAs from weighted point and credit sums (NaN without credits)."""
+    # Python's round() is used per student (not np.round) to keep the exact
+    # half-way behaviour of the original calculation.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = total_points / total_credits
+    gpas = [
+        round(r, 2) if c > 0 else np.nan
+        for r, c in zip(ratio.tolist(), total_credits.tolist())
+    ]
+    return np.array(gpas, dtype=np.float64)
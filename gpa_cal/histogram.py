@@ -0,0 +1,83 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .grading import GP_MAP
+
+
+class GpaHistogram:
+    """
+    Student counts in fixed-width GPA bins, kept up to date as GPAs change.
+
+    GPAs are scaled to integers (hundredths by default) and binned with
+    ``np.bincount``; changing one student's GPA moves one count. The chart
+    series is built once per change instead of from the raw rows on every
+    rerun.
+    """
+
+    def __init__(
+        self,
+        width: float = 0.1,
+        scale: int = 100,
+        max_gpa: float = max(GP_MAP.values()),
+    ):
+        step = round(width * scale)
+        if step < 1 or abs(step - width * scale) > 1e-9:
+            raise ValueError(f"bin width {width} is not a multiple of 1/{scale}")
+        self.width = width
+        self.scale = scale
+        self._step = step
+        self._max_key = int(round(max_gpa * scale))
+        # Bin i holds GPAs in [i * width, (i + 1) * width); the top GPA gets its own bin
+        self.counts = np.zeros(self._max_key // step + 1, dtype=np.int64)
+        self._series: Optional[pd.Series] = None
+
+    @classmethod
+    def from_gpas(cls, gpas: Iterable[float], **kwargs) -> "GpaHistogram":
+        histogram = cls(**kwargs)
+        histogram.add(gpas)
+        return histogram
+
+    def __len__(self) -> int:
+        return int(self.counts.sum())
+
+    def _bins(self, gpas: Iterable[float]) -> np.ndarray:
+        keys = np.rint(np.asarray(gpas, dtype="float64") * self.scale).astype(np.int64)
+        if keys.size and (keys.min() < 0 or keys.max() > self._max_key):
+            raise ValueError(f"GPA out of range 0-{self._max_key / self.scale}")
+        return keys // self._step
+
+    def add(self, gpas: Iterable[float]) -> None:
+        """Count every GPA in ``gpas``."""
+        self.counts += np.bincount(self._bins(gpas), minlength=len(self.counts))
+        self._series = None
+
+    def remove(self, gpas: Iterable[float]) -> None:
+        """Un-count every GPA in ``gpas`` (each must have been added)."""
+        self.counts -= np.bincount(self._bins(gpas), minlength=len(self.counts))
+        self._series = None
+
+    def update(self, old: Optional[float], new: Optional[float]) -> None:
+        """One student's GPA changed from ``old`` to ``new`` (None: absent)."""
+        if old == new:
+            return
+        if old is not None:
+            self.counts[self._bins([old])[0]] -= 1
+        if new is not None:
+            self.counts[self._bins([new])[0]] += 1
+        self._series = None
+
+    def edges(self) -> np.ndarray:
+        """Lower edge of every bin."""
+        return np.round(np.arange(len(self.counts)) * self._step / self.scale, 2)
+
+    def series(self) -> pd.Series:
+        """Counts indexed by bin lower edge, for ``st.bar_chart``; cached until the next change."""
+        if self._series is None:
+            self._series = pd.Series(
+                self.counts.copy(),
+                index=pd.Index(self.edges(), name="GPA"),
+                name="Students",
+            )
+        return self._series
@@ -0,0 +1,121 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Receives every timing event as it is recorded (or merged from a worker)
+Sink = Callable[[Dict[str, Any]], None]
+
+
+class Profile:
+    """
+    Stage timers and counters for one parsing / ranking run.
+
+    ``timer`` records the wall time of a stage, ``count`` bumps a counter.
+    Every timer also produces an event dict (stage, seconds and any labels
+    such as file or page) that is kept for per-file / per-page reports and
+    passed to ``sink`` when one is set; counters bumped with a ``file`` are
+    also kept per file. Profiles are picklable, so worker
+    processes fill their own and the parent ``merge``s them.
+    """
+
+    def __init__(self, sink: Optional[Sink] = None):
+        self.sink = sink
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+        # Counters also kept per file when counted with a file label
+        self.file_counters: Dict[str, Dict[str, int]] = {}
+        self.events: List[Dict[str, Any]] = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["sink"] = None
+        return state
+
+    @contextmanager
+    def timer(self, stage: str, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record({"stage": stage, "seconds": time.perf_counter() - start, **labels})
+
+    def count(self, name: str, n: int = 1, file: Optional[str] = None) -> None:
+        self.counters[name] += n
+        if file is not None:
+            self.file_counters.setdefault(file, defaultdict(int))[name] += n
+
+    def merge(self, other: "Profile") -> None:
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        for file, counters in other.file_counters.items():
+            mine = self.file_counters.setdefault(file, defaultdict(int))
+            for name, value in counters.items():
+                mine[name] += value
+        for event in other.events:
+            self._record(event)
+
+    def _record(self, event: Dict[str, Any]) -> None:
+        self.timings[event["stage"]] += event["seconds"]
+        self.calls[event["stage"]] += 1
+        self.events.append(event)
+        if self.sink is not None:
+            self.sink(event)
+
+    def files(self) -> Dict[str, Dict[str, Any]]:
+        """Per-file totals: seconds per stage, per-page timings and counters."""
+        report: Dict[str, Dict[str, Any]] = {}
+
+        def entry(name: str) -> Dict[str, Any]:
+            return report.setdefault(
+                name, {"stages": defaultdict(float), "pages": {}, "counters": {}}
+            )
+
+        for event in self.events:
+            if "file" not in event:
+                continue
+            file_entry = entry(event["file"])
+            file_entry["stages"][event["stage"]] += event["seconds"]
+            if "page" in event:
+                page = file_entry["pages"].setdefault(event["page"], defaultdict(float))
+                page[event["stage"]] += event["seconds"]
+        for name, counters in self.file_counters.items():
+            entry(name)["counters"] = dict(counters)
+        return report
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable summary."""
+        files = {
+            name: {
+                "stages": dict(entry["stages"]),
+                "pages": {str(p): dict(s) for p, s in sorted(entry["pages"].items())},
+                "counters": entry["counters"],
+            }
+            for name, entry in self.files().items()
+        }
+        return {
+            "stages": {
+                stage: {"seconds": seconds, "calls": self.calls[stage]}
+                for stage, seconds in self.timings.items()
+            },
+            "counters": dict(self.counters),
+            "files": files,
+        }
+
+
+@contextmanager
+def maybe_timer(profile: Optional[Profile], stage: str, **labels: Any) -> Iterator[None]:
+    """``profile.timer(...)`` that does nothing when profiling is off."""
+    if profile is None:
+        yield
+    else:
+        with profile.timer(stage, **labels):
+            yield
+
+
+def maybe_count(
+    profile: Optional[Profile], name: str, n: int = 1, file: Optional[str] = None
+) -> None:
+    if profile is not None:
+        profile.count(name, n, file)
@@ -0,0 +1,226 @@
+from bisect import bisect_right
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from pdfplumber.utils import extract_text
+from pdfplumber.utils.text import LIGATURES
+
+# Page width, page height and the x of every column boundary of the
+# table, in whole points. Sheets printed from the same template share one.
+Fingerprint = Tuple[int, int, Tuple[int, ...]]
+
+# Gap (points) between two glyphs that starts a new word, and the vertical
+# tolerance for glyphs on one line; pdfplumber's defaults
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+
+class LayoutTemplate(NamedTuple):
+    """Column boundaries of a ruled results table and its header row."""
+
+    columns: Tuple[float, ...]
+    header: Tuple[str, ...]
+
+
+# Learned templates per fingerprint, shared by every sheet parsed in this
+# process. None marks a layout the fast path got wrong, so it is not retried.
+_TEMPLATES: Dict[Fingerprint, Optional[LayoutTemplate]] = {}
+
+
+class Grid(NamedTuple):
+    """Ruling of the table on one page: column x boundaries and y extent."""
+
+    columns: Tuple[float, ...]
+    top: float
+    bottom: float
+
+
+def table_grid(page) -> Optional[Grid]:
+    """
+    The ruled table of a page, or None if it has no column grid.
+
+    The table is the ruling around the tallest vertical line; boxes drawn
+    elsewhere (e.g. around the page heading) are ignored.
+    """
+    edges = page.vertical_edges
+    if not edges:
+        return None
+    tallest = max(edges, key=lambda e: e["bottom"] - e["top"])
+    top, bottom = tallest["top"], tallest["bottom"]
+    bounds: Dict[int, float] = {}
+    for edge in edges:
+        if edge["bottom"] > top + Y_TOLERANCE and edge["top"] < bottom - Y_TOLERANCE:
+            bounds.setdefault(round(edge["x0"]), edge["x0"])
+            top = min(top, edge["top"])
+            bottom = max(bottom, edge["bottom"])
+    if len(bounds) < 3:
+        return None
+    return Grid(tuple(sorted(bounds.values())), top, bottom)
+
+
+def layout_fingerprint(page, grid: Grid) -> Fingerprint:
+    return round(page.width), round(page.height), tuple(round(x) for x in grid.columns)
+
+
+def get_template(fingerprint: Fingerprint) -> Optional[LayoutTemplate]:
+    return _TEMPLATES.get(fingerprint)
+
+
+def is_known(fingerprint: Fingerprint) -> bool:
+    return fingerprint in _TEMPLATES
+
+
+def remember_template(
+    fingerprint: Fingerprint, template: Optional[LayoutTemplate]
+) -> None:
+    _TEMPLATES[fingerprint] = template
+
+
+def clear_templates() -> None:
+    _TEMPLATES.clear()
+
+
+def _row_bounds(page, grid: Grid) -> Optional[List[float]]:
+    """
+    y of every horizontal ruling line across the whole table, or None if
+    the ruling does not cut the table into whole rows: a rule inside the
+    grid with no full-width rule at its height (a merged or partly ruled
+    row, which ``extract_table`` reads differently), or no rule at the
+    grid's top or bottom.
+    """
+    left, right = grid.columns[0] + 1, grid.columns[-1] - 1
+    top, bottom = grid.top - Y_TOLERANCE, grid.bottom + Y_TOLERANCE
+    inside = [
+        edge
+        for edge in page.horizontal_edges
+        if top <= edge["top"] <= bottom and edge["x1"] > left and edge["x0"] < right
+    ]
+    for rule in _clusters(inside, itemgetter("top")):
+        if not any(edge["x0"] <= left and edge["x1"] >= right for edge in rule):
+            return None
+    ys = sorted({
+        round(edge["top"], 1)
+        for edge in inside
+        if edge["x0"] <= left and edge["x1"] >= right
+    })
+    if not ys or abs(ys[0] - grid.top) > Y_TOLERANCE or abs(ys[-1] - grid.bottom) > Y_TOLERANCE:
+        return None
+    return ys
+
+
+# Glyphs a registration number can start with, as REG_PATTERN matches them
+_REG_FIRST = frozenset("Iiİı")
+_REG_SECOND = frozenset("Tt")
+
+
+def may_have_rows(chars: List[dict]) -> bool:
+    """
+    Whether a page's glyphs hold an "IT" pair that could start a
+    registration-number cell: an I followed on the same line by a T at most
+    ``X_TOLERANCE`` to its right (farther apart they would be two words).
+    A page without one cannot yield a results row, so its table extraction
+    can be skipped.
+    """
+    seconds: Dict[int, List[dict]] = {}
+    for char in chars:
+        if char["text"] in _REG_SECOND:
+            seconds.setdefault(round(char["top"]), []).append(char)
+    if not seconds:
+        return False
+    for first in chars:
+        if first["text"] not in _REG_FIRST:
+            continue
+        line = round(first["top"])
+        for top in range(line - Y_TOLERANCE - 1, line + Y_TOLERANCE + 2):
+            for second in seconds.get(top, ()):
+                if (
+                    abs(second["top"] - first["top"]) <= Y_TOLERANCE
+                    and first["x0"] < second["x0"] <= first["x1"] + X_TOLERANCE
+                ):
+                    return True
+    return False
+
+
+def _clusters(items: list, key) -> List[list]:
+    """
+    ``items`` grouped by ``key`` values chained within ``Y_TOLERANCE`` of
+    each other, in key order, keeping input order inside a group (as
+    pdfplumber's ``cluster_objects``).
+    """
+    cluster_of: Dict[float, int] = {}
+    last = None
+    for value in sorted({key(item) for item in items}):
+        if last is not None and value > last + Y_TOLERANCE:
+            cluster_of[value] = cluster_of[last] + 1
+        else:
+            cluster_of[value] = cluster_of[last] if last is not None else 0
+        last = value
+    groups: List[list] = [[] for _ in range(len(set(cluster_of.values())))]
+    for item in items:
+        groups[cluster_of[key(item)]].append(item)
+    return groups
+
+
+def _cell_text(chars: List[dict]) -> str:
+    """
+    Text of a cell as ``extract_table`` gives it (pdfplumber's
+    ``extract_text`` with default settings): words joined by spaces, and
+    the lines of a wrapped cell joined by newlines.
+    """
+    if any(not c["upright"] or c["text"] in LIGATURES for c in chars):
+        return extract_text(chars)
+
+    words: List[Tuple[float, str]] = []
+    for line in _clusters(chars, itemgetter("top")):
+        line.sort(key=itemgetter("x0"))
+        word: List[dict] = []
+        for char in line:
+            if char["text"].isspace():
+                if word:
+                    words.append((min(c["top"] for c in word), "".join(c["text"] for c in word)))
+                word = []
+                continue
+            if word:
+                prev = word[-1]
+                if (
+                    char["x0"] < prev["x0"]
+                    or char["x0"] > prev["x1"] + X_TOLERANCE
+                    or char["top"] > prev["top"] + Y_TOLERANCE
+                ):
+                    words.append((min(c["top"] for c in word), "".join(c["text"] for c in word)))
+                    word = []
+            word.append(char)
+        if word:
+            words.append((min(c["top"] for c in word), "".join(c["text"] for c in word)))
+    return "\n".join(
+        " ".join(text for _, text in line) for line in _clusters(words, itemgetter(0))
+    )
+
+
+def template_table(page, grid: Grid) -> Optional[List[List[str]]]:
+    """
+    Table rows of a page, header included, or None if the page's ruling
+    does not fit a template (see ``_row_bounds``).
+
+    Rows come from the horizontal ruling lines inside ``grid``; every glyph
+    is placed in the cell containing its centre. This skips pdfplumber's
+    table finder (edge merging and cell detection) entirely.
+    """
+    columns = grid.columns
+    rows = _row_bounds(page, grid)
+    if rows is None:
+        return None
+    if len(rows) < 2:
+        return []
+    n_cols = len(columns) - 1
+    n_rows = len(rows) - 1
+    cells: Dict[Tuple[int, int], List[dict]] = {}
+    for char in page.chars:
+        col = bisect_right(columns, (char["x0"] + char["x1"]) / 2) - 1
+        row = bisect_right(rows, (char["top"] + char["bottom"]) / 2) - 1
+        if 0 <= col < n_cols and 0 <= row < n_rows:
+            cells.setdefault((row, col), []).append(char)
+    return [
+        [_cell_text(cells[r, c]) if (r, c) in cells else "" for c in range(n_cols)]
+        for r in range(n_rows)
+    ]
@@ -0,0 +1,57 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class Leaderboard:
+    """
+    Top-K, bottom-K and rank-window queries over a results dataframe.
+
+    Students are ordered by GPA (best first), ties in frame order, i.e. as
+    ``df.sort_values("GPA", ascending=False, kind="stable")`` would order
+    them. Each query selects its rows with ``np.argpartition`` and sorts
+    only those, so showing the top 100 of a large cohort never sorts the
+    whole frame.
+    """
+
+    def __init__(self, df: pd.DataFrame, scale: int = 100):
+        self._df = df
+        gpa = df["GPA"].to_numpy(dtype="float64")
+        n = len(gpa)
+        # One distinct integer per student: GPA bucket (best first), then
+        # frame position, so partial selection is deterministic under ties
+        buckets = np.rint(gpa * scale).astype(np.int64)
+        self._keys = (buckets.max(initial=0) - buckets) * n + np.arange(n, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def positions(self, start: int, stop: int) -> np.ndarray:
+        """Frame positions of leaderboard places ``start`` to ``stop - 1`` (0-based)."""
+        n = len(self._keys)
+        start, stop = max(0, start), min(n, stop)
+        if start >= stop:
+            return np.empty(0, dtype=np.intp)
+        if start == 0 and stop == n:
+            picked = np.arange(n)
+        else:
+            kth = [start, stop - 1] if stop - 1 > start else [start]
+            picked = np.argpartition(self._keys, kth)[start:stop]
+        return picked[np.argsort(self._keys[picked])]
+
+    def window(
+        self, start: int, stop: int, columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Rows at leaderboard places ``start`` to ``stop`` (1-based, inclusive)."""
+        rows = self._df.iloc[self.positions(start - 1, stop)]
+        return rows if columns is None else rows[columns]
+
+    def top(self, k: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """The ``k`` best students, best first."""
+        return self.window(1, k, columns)
+
+    def bottom(self, k: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """The ``k`` lowest-placed students, in leaderboard order (worst last)."""
+        n = len(self._keys)
+        return self.window(n - k + 1, n, columns)
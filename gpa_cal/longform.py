@@ -0,0 +1,152 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import ParseCache
+from .grading import _grade_to_gp, credit_vector, weighted_gpa
+from .instrumentation import Profile, maybe_timer
+from .parsing import FileResult, Row, Source, iter_result_rows, parse_file_results
+
+
+LONG_COLUMNS = ["Registration No", "Module", "Grade"]
+
+
+class GradeBuffer:
+    """
+    Columnar buffer of ``(registration no, module, grade)`` rows.
+
+    Rows are appended in parse order; later rows for the same student and
+    module win when the buffer is turned into a long table.
+    """
+
+    def __init__(self):
+        self.reg_nos: List[str] = []
+        self.modules: List[str] = []
+        self.grades: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.reg_nos)
+
+    def add(self, reg_no: str, module: str, grade: Optional[str]) -> None:
+        self.reg_nos.append(reg_no)
+        self.modules.append(module)
+        self.grades.append(grade)
+
+    def extend(self, rows: Iterable[Row]) -> None:
+        for reg_no, module, grade in rows:
+            self.add(reg_no, module, grade)
+
+    def add_file(self, result: FileResult) -> None:
+        """Append one sheet's parse result (skipped without a module code)."""
+        module_code, grades = result
+        if not module_code or not grades:
+            return
+        self.reg_nos.extend(grades)
+        self.modules.extend([module_code] * len(grades))
+        self.grades.extend(grades.values())
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long table with one row per (student, module), last write wins."""
+        df = pd.DataFrame(
+            {
+                "Registration No": self.reg_nos,
+                "Module": pd.Categorical(self.modules),
+                "Grade": pd.Series(self.grades, dtype=object),
+            },
+            columns=LONG_COLUMNS,
+        )
+        return df.drop_duplicates(["Registration No", "Module"], keep="last")
+
+
+def iter_long_rows(results: Iterable[FileResult]) -> Iterator[Row]:
+    """``(registration no, module, grade)`` for every row of every sheet."""
+    for module_code, grades in results:
+        if not module_code or not grades:
+            continue
+        for reg_no, grade in grades.items():
+            yield reg_no, module_code, grade
+
+
+def long_gpa(long_df: pd.DataFrame) -> pd.Series:
+    """
+    GPA per student from a long grade table, indexed by registration number
+    (sorted). Students without graded credits get NaN.
+    """
+    student_codes, students = pd.factorize(long_df["Registration No"], sort=True)
+    module_codes, modules = pd.factorize(long_df["Module"].astype(object), sort=True)
+
+    grades = long_df["Grade"].to_numpy(dtype=object)
+    codes, uniques = pd.factorize(grades)
+    lut = np.array(
+        [np.nan if (gp := _grade_to_gp(u)) is None else gp for u in uniques] + [np.nan],
+        dtype=np.float64,
+    )
+    gp = lut[codes]
+    graded = ~np.isnan(gp)
+
+    gpas = weighted_gpa(
+        student_codes[graded],
+        module_codes[graded],
+        gp[graded],
+        credit_vector(list(modules)),
+        len(students),
+    )
+    return pd.Series(gpas, index=pd.Index(students, name="Registration No"), name="GPA")
+
+
+def pivot_wide(long_df: pd.DataFrame, gpa: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Wide student x module frame (Registration No, modules..., GPA) from a
+    long table, matching ``parse_result_pdfs``. Only meant for display and
+    export.
+    """
+    if long_df.empty:
+        return pd.DataFrame(columns=["Registration No", "GPA"])
+    if gpa is None:
+        gpa = long_gpa(long_df)
+
+    student_codes, students = pd.factorize(long_df["Registration No"], sort=True)
+    module_codes, modules = pd.factorize(long_df["Module"].astype(object), sort=True)
+    block = np.full((len(students), len(modules)), None, dtype=object)
+    block[student_codes, module_codes] = long_df["Grade"].to_numpy(dtype=object)
+
+    df = pd.DataFrame(block, columns=list(modules))
+    df.insert(0, "Registration No", [str(s).replace(" ", "") for s in students])
+    df["GPA"] = gpa.reindex(students).to_numpy()
+    return df.dropna(subset=["GPA"])
+
+
+def parse_result_long(
+    files: List[Tuple[str, bytes]],
+    workers: Optional[int] = 1,
+    cache: Optional[ParseCache] = None,
+    profile: Optional[Profile] = None,
+) -> pd.DataFrame:
+    """
+    Parse result sheets into a long ``(Registration No, Module, Grade)``
+    table. Memory grows with the number of grades, not students x modules;
+    use :func:`long_gpa` and :func:`pivot_wide` on the result.
+    """
+    buffer = GradeBuffer()
+    for result in parse_file_results(files, workers, cache, profile):
+        buffer.add_file(result)
+    with maybe_timer(profile, "long_build"):
+        return buffer.to_frame()
+
+
+def parse_result_stream(
+    sources: Iterable[Source],
+    profile: Optional[Profile] = None,
+) -> pd.DataFrame:
+    """
+    Wide results frame (as from ``parse_result_pdfs``) built from
+    :func:`iter_result_rows`: sheets are opened one at a time and only the
+    parsed rows are kept, never all the PDF bytes at once.
+    """
+    buffer = GradeBuffer()
+    buffer.extend(iter_result_rows(sources, profile))
+    with maybe_timer(profile, "long_build"):
+        long_df = buffer.to_frame()
+    with maybe_timer(profile, "frame_build"):
+        return pivot_wide(long_df)
@@ -0,0 +1,71 @@
+import difflib
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+def normalize_reg_no(reg_no: str) -> str:
+    """Lookup key for a registration number: upper case, no whitespace."""
+    return "".join(str(reg_no).split()).upper()
+
+
+class StudentIndex:
+    """
+    Hash index over the "Registration No" column of a results dataframe.
+
+    Built once per parsed dataset; exact lookups are a dict probe, prefix
+    searches and suggestions use a sorted key list with bisect.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._positions: Dict[str, int] = {}
+        for pos, reg_no in enumerate(df["Registration No"].tolist()):
+            # Keep the first row for a key, like the old boolean-mask lookup
+            self._positions.setdefault(normalize_reg_no(reg_no), pos)
+        self._keys: List[str] = sorted(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, reg_no: str) -> bool:
+        return normalize_reg_no(reg_no) in self._positions
+
+    def get(self, reg_no: str) -> Optional[pd.Series]:
+        """Row for ``reg_no``, or None when it is not in the dataset."""
+        pos = self._positions.get(normalize_reg_no(reg_no))
+        return None if pos is None else self._df.iloc[pos]
+
+    def prefix_search(self, prefix: str, limit: int = 10) -> List[str]:
+        """Up to ``limit`` normalized registration numbers starting with ``prefix``."""
+        prefix = normalize_reg_no(prefix)
+        start = bisect_left(self._keys, prefix)
+        matches = []
+        for key in self._keys[start:start + limit]:
+            if not key.startswith(prefix):
+                break
+            matches.append(key)
+        return matches
+
+    def suggest(self, reg_no: str, limit: int = 5, pool: int = 50) -> List[str]:
+        """
+        "Did you mean" candidates for a registration number that was not found.
+
+        Candidates are drawn from the neighbourhood of the longest prefix that
+        still matches something, so the cost does not grow with the cohort.
+        """
+        key = normalize_reg_no(reg_no)
+        if not key or not self._keys:
+            return []
+
+        for n in range(len(key), 0, -1):
+            start = bisect_left(self._keys, key[:n])
+            if start < len(self._keys) and self._keys[start].startswith(key[:n]):
+                break
+        else:
+            start = bisect_left(self._keys, key)
+
+        lo = max(0, start - pool // 2)
+        candidates = self._keys[lo:lo + pool]
+        return difflib.get_close_matches(key, candidates, n=limit, cutoff=0.6)
@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Normalise a worker count; ``None`` or ``0`` means one per CPU."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def ordered_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: Optional[int] = 1,
+) -> List[R]:
+    """
+    Apply ``func`` to every item, optionally in a process pool.
+
+    Results are always returned in input order, so merging them afterwards
+    gives the same outcome as the serial loop. ``func`` must be a module-level
+    function so it can be pickled into the workers.
+    """
+    items = list(items)
+    n_workers = min(resolve_workers(workers), len(items))
+    if n_workers <= 1:
+        return [func(item) for item in items]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(func, items))
@@ -0,0 +1,555 @@
+import io
+import mmap
+import os
+import tempfile
+from functools import partial
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+from PyPDF2 import PdfReader
+
+from .cache import ParseCache, content_key
+from .instrumentation import Profile, maybe_count, maybe_timer
+from .backends import (
+    DEFAULT_BACKEND,
+    SheetDocument,
+    UnsupportedSheet,
+    auto_backends,
+    get_backend,
+)
+from .parallel import ordered_map, resolve_workers
+from .patterns import GRADE_PATTERN, MODULE_PATTERN, REG_PATTERN
+from .rows import ParsedRow, RowClassifier, parse_rows
+from .store import GradeStore
+
+
+# Bump whenever a change to the parser can alter its output for the same
+# PDF, so stale cache entries stop matching.
+PARSER_VERSION = 4
+
+_PARSER_FINGERPRINT = "\x00".join(
+    [f"v{PARSER_VERSION}"]
+    + [f"{p.pattern}/{p.flags}" for p in (MODULE_PATTERN, GRADE_PATTERN, REG_PATTERN)]
+)
+
+# (module code, {registration no: grade}) parsed from a single sheet
+FileResult = Tuple[Optional[str], Dict[str, Optional[str]]]
+
+# (registration no, module code, grade) streamed from a sheet
+Row = Tuple[str, str, Optional[str]]
+
+# A sheet to parse: file path, binary file object or (filename, bytes)
+Source = Union[str, "os.PathLike[str]", BinaryIO, Tuple[str, bytes]]
+
+# A parse job: (index into the file list, source, filename override, and
+# the [start, stop) page range, or None for the whole sheet)
+Job = Tuple[int, Source, Optional[str], Optional[Tuple[int, int]]]
+
+# Long sheets are split into page ranges of at least this many pages
+MIN_RANGE_PAGES = 25
+
+
+def _extract_module_code_from_name(name: str) -> Optional[str]:
+    m = MODULE_PATTERN.search(name)
+    return m.group(1).upper() if m else None
+
+
+def parse_cache_key(
+    filename: str, file_bytes: Union[bytes, mmap.mmap], backend: str = "auto"
+) -> str:
+    """
+    Content hash identifying the parse result of one sheet.
+
+    Only the module code part of the filename is keyed, so a renamed copy of
+    the same sheet still hits the cache. Every backend, ``"auto"``
+    included, is keyed apart (the default backend keeps the unsuffixed
+    key), so asking for a specific backend never gets another's rows.
+    """
+    module_code = _extract_module_code_from_name(filename) or ""
+    parts = [_PARSER_FINGERPRINT, module_code]
+    if backend != DEFAULT_BACKEND:
+        parts.append(backend)
+    return content_key(file_bytes, *parts)
+
+
+def _map_path(path: "Union[str, os.PathLike[str]]") -> Union[mmap.mmap, bytes]:
+    """
+    Read-only memory map of a PDF on disk.
+
+    pdfminer reads through the map in small chunks, so pages are paged in
+    from the OS cache as they are analysed instead of the whole file being
+    copied into a bytes object first. Files that cannot be mapped (empty or
+    special files) are read into bytes instead.
+    """
+    with open(path, "rb") as fh:
+        try:
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return fh.read()
+
+
+def _open_source(source: Source) -> Tuple[str, BinaryIO, bool]:
+    """(display name, binary stream, whether we opened it and must close it)."""
+    if isinstance(source, (str, os.PathLike)):
+        mapped = _map_path(source)
+        if isinstance(mapped, bytes):
+            mapped = io.BytesIO(mapped)
+        return os.path.basename(os.fspath(source)), mapped, True
+    if isinstance(source, tuple):
+        filename, file_bytes = source
+        return filename, io.BytesIO(file_bytes), True
+    name = getattr(source, "name", None) or "upload.pdf"
+    return os.path.basename(str(name)), source, False
+
+
+def _find_module(text: str) -> Optional[str]:
+    mm = MODULE_PATTERN.search(text)
+    return mm.group(1).upper() if mm else None
+
+
+def _page_rows(
+    document: SheetDocument, index: int, profile: Optional[Profile]
+) -> List[ParsedRow]:
+    """(registration no, grade) of every results row on a page."""
+    table_rows = document.page_rows(index)
+    classifier = RowClassifier()
+    with maybe_timer(profile, "row_scan", file=document.filename, page=index + 1):
+        rows = parse_rows(table_rows, classifier)
+    filename = document.filename
+    maybe_count(profile, "rows", len(table_rows), file=filename)
+    maybe_count(profile, "rows_rejected", len(table_rows) - len(rows), file=filename)
+    maybe_count(profile, "rows_by_column", classifier.hits, file=filename)
+    return rows
+
+
+def _agrees(document: SheetDocument, reference: SheetDocument, module_known: bool) -> bool:
+    """
+    Whether ``document`` reads the first, middle and last of its pages the
+    same as ``reference`` (and, when the filename has none, finds the same
+    module code on the first of them), and lays out every other page's
+    rows with the same numbers of cells as on those pages.
+    """
+    if len(document) != len(reference):
+        return False
+    indexes = document.page_indexes()
+    if not indexes:
+        return True
+    checked = sorted({indexes[0], indexes[len(indexes) // 2], indexes[-1]})
+    for i in checked:
+        if i == indexes[0] and not module_known:
+            module_code = _find_module(document.page_text(i))
+            if module_code is None or module_code != _find_module(reference.page_text(i)):
+                return False
+        if _page_rows(document, i, None) != _page_rows(reference, i, None):
+            return False
+    # A row wider or narrower than any checked one (e.g. a two-word status)
+    # can shift which cell is read as the grade
+    widths = set().union(*(document.row_widths(i) for i in checked))
+    return all(document.row_widths(i) <= widths for i in indexes)
+
+
+def _open_document(
+    filename: str,
+    stream: BinaryIO,
+    backend: str,
+    module_known: bool,
+    profile: Optional[Profile],
+    pages: Optional[range] = None,
+) -> SheetDocument:
+    """
+    Open a sheet with ``backend``. ``"auto"`` tries every auto backend and
+    keeps the first that agrees with the default backend on sample pages;
+    sheets no candidate can read go to the default backend.
+    """
+    default = get_backend(DEFAULT_BACKEND)
+    for name in auto_backends() if backend == "auto" else [backend]:
+        document_cls = get_backend(name)
+        if document_cls is default:
+            break
+        try:
+            document = document_cls(filename, stream, profile, pages)
+        except UnsupportedSheet:
+            maybe_count(profile, "backend_fallbacks")
+            continue
+        if backend != "auto":
+            return document
+        with maybe_timer(profile, "backend_validate", file=filename):
+            with default(filename, stream, None, pages) as reference:
+                agrees = _agrees(document, reference, module_known)
+        if agrees:
+            return document
+        document.close()
+        maybe_count(profile, "backend_fallbacks")
+    return default(filename, stream, profile, pages)
+
+
+def _iter_pages(
+    source: Source,
+    profile: Optional[Profile],
+    backend: str,
+    pages: Optional[range] = None,
+    filename: Optional[str] = None,
+) -> Iterator[Tuple[Optional[str], List[ParsedRow]]]:
+    """
+    ``(module code, rows)`` for every page of a sheet (or the page indexes
+    in ``pages``). The module code is the one known so far: from the
+    filename (``filename`` overrides the source's name), or the first page
+    text of this range that names one, and None before that.
+    """
+    name, stream, owned = _open_source(source)
+    filename = filename or name
+    module_code = _extract_module_code_from_name(filename)
+    try:
+        with _open_document(
+            filename, stream, backend, bool(module_code), profile, pages
+        ) as document:
+            for index in document.page_indexes():
+                maybe_count(profile, "pages")
+                maybe_count(profile, f"{document.name}_pages")
+
+                # Try to find module code in text if not in filename
+                if not module_code:
+                    module_code = _find_module(document.page_text(index))
+
+                yield module_code, _page_rows(document, index, profile)
+    finally:
+        if owned:
+            stream.close()
+
+
+def iter_sheet_rows(
+    source: Source,
+    profile: Optional[Profile] = None,
+    backend: str = "auto",
+) -> Iterator[Row]:
+    """
+    Stream ``(registration no, module, grade)`` rows from one sheet.
+
+    Rows are yielded page by page as they are extracted. Every page is
+    visited once: when the module code is not in the filename it is searched
+    for in the page text during the same visit, and rows are held back until
+    it is found (rows of a sheet without a module code are dropped). Later
+    rows for the same student win.
+
+    :param source: file path, file object, or (filename, bytes) tuple
+    :param profile: optional profile to record per-page timings and counts in
+    :param backend: a registered extraction backend (see
+        :func:`~gpa_cal.backends.register_backend`), or ``"auto"`` to read
+        plainly tabulated sheets from their text layer (checked against
+        pdfplumber on sample pages) and everything else with pdfplumber
+    """
+    if backend != "auto":
+        get_backend(backend)
+    pending: List[ParsedRow] = []
+    for module_code, rows in _iter_pages(source, profile, backend):
+        if not module_code:
+            pending.extend(rows)
+            continue
+        if pending:
+            rows = pending + rows
+            pending = []
+        for reg_no, grade in rows:
+            yield reg_no, module_code, grade
+
+
+def iter_result_rows(
+    sources: Iterable[Source],
+    profile: Optional[Profile] = None,
+    backend: str = "auto",
+) -> Iterator[Row]:
+    """
+    Stream ``(registration no, module, grade)`` rows from many sheets.
+
+    Sources (paths, file objects, (filename, bytes) tuples or an iterator of
+    uploads) are opened lazily, one at a time, and each PDF is released
+    before the next is opened. Later rows win for the same student and
+    module.
+    """
+    for source in sources:
+        yield from iter_sheet_rows(source, profile, backend)
+
+
+def parse_pdf(
+    file: Source,
+    profile: Optional[Profile] = None,
+    backend: str = "auto",
+) -> FileResult:
+    """
+    Parse a single PDF result sheet.
+
+    :param file: (filename, bytes) tuple, file path or file object
+    :param profile: optional profile to record per-page timings and counts in
+    :param backend: extraction backend, see :func:`iter_sheet_rows`
+    :return: (module code, {registration no: grade}); later rows win
+    """
+    module_code = None
+    grades: Dict[str, Optional[str]] = {}
+    for reg_no, module_code, grade in iter_sheet_rows(file, profile, backend):
+        grades[reg_no] = grade
+    return module_code, grades
+
+
+def _parse_job(
+    job: Job, backend: str = "auto", catch: bool = False
+) -> Tuple[Any, Profile, Optional[str]]:
+    """
+    Worker entry point returning the result together with its profile and,
+    with ``catch``, the error that stopped the job (else None; without
+    ``catch`` errors propagate). Paths are opened by the worker, so the
+    parent never holds their bytes.
+
+    A whole-sheet job gives the sheet's :data:`FileResult`; a page-range job
+    gives ``(module code, rows in page order)`` for :func:`_merge_ranges`.
+    """
+    _, source, filename, pages = job
+    profile = Profile()
+    try:
+        if pages is None:
+            return parse_pdf(source, profile, backend), profile, None
+
+        module_code = None
+        rows: List[ParsedRow] = []
+        for module_code, page_rows in _iter_pages(
+            source, profile, backend, range(*pages), filename
+        ):
+            rows.extend(page_rows)
+        return (module_code, rows), profile, None
+    except Exception as exc:
+        if not catch:
+            raise
+        # Reported as text: not every exception survives pickling
+        return None, profile, f"{type(exc).__name__}: {exc}"
+
+
+def _merge_ranges(parts: List[Tuple[Optional[str], List[ParsedRow]]]) -> FileResult:
+    """
+    Sheet result from its page ranges in order, as :func:`parse_pdf` would
+    give it: the first module code found applies to every row, and later
+    rows win.
+    """
+    module_code = next((m for m, _ in parts if m), None)
+    grades: Dict[str, Optional[str]] = {}
+    if module_code:
+        for _, rows in parts:
+            for reg_no, grade in rows:
+                grades[reg_no] = grade
+    return (module_code, grades) if grades else (None, {})
+
+
+def _page_count(source: Source) -> Optional[int]:
+    """Pages in a (filename, bytes) or path sheet; None if unknown."""
+    if isinstance(source, tuple):
+        stream: Any = io.BytesIO(source[1])
+    elif isinstance(source, (str, os.PathLike)):
+        stream = _map_path(source)
+        if isinstance(stream, bytes):
+            stream = io.BytesIO(stream)
+    else:
+        return None
+    try:
+        return len(PdfReader(stream).pages)
+    except Exception:
+        # Left whole; parsing it reports the problem
+        return None
+    finally:
+        stream.close()
+
+
+def _plan_jobs(
+    files: List[Source], indexes: List[int], workers: Optional[int]
+) -> Tuple[List[Job], List[str]]:
+    """
+    Jobs parsing ``files[i]`` for every i in ``indexes``, and the temporary
+    files the jobs read from.
+
+    With several workers, sheets longer than their fair share of the pages
+    (but at least ``MIN_RANGE_PAGES``) are split into page ranges that the
+    workers parse concurrently. Every range job reopens the sheet from disk
+    (memory-mapped); uploaded bytes are written to a temporary file once so
+    the workers share it instead of each getting a pickled copy.
+    """
+    n_workers = resolve_workers(workers)
+    jobs: List[Job] = []
+    spilled: List[str] = []
+    counts = {i: _page_count(files[i]) for i in indexes} if n_workers > 1 else {}
+    share = max(MIN_RANGE_PAGES, -(-sum(filter(None, counts.values())) // n_workers))
+
+    for i in indexes:
+        source = files[i]
+        count = counts.get(i)
+        if not count or count <= share:
+            jobs.append((i, source, None, None))
+            continue
+
+        if isinstance(source, tuple):
+            filename, file_bytes = source
+            fd, path = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(file_bytes)
+            spilled.append(path)
+            source = path
+        else:
+            filename = os.path.basename(os.fspath(source))
+
+        n_ranges = -(-count // share)
+        size = -(-count // n_ranges)
+        for start in range(0, count, size):
+            jobs.append((i, source, filename, (start, min(start + size, count))))
+    return jobs, spilled
+
+
+def merge_file_results(
+    results: List[FileResult],
+    profile: Optional[Profile] = None,
+) -> pd.DataFrame:
+    """
+    Merge per-file results (in upload order) into a wide student x module
+    dataframe with a GPA column. Later files win for duplicate cells.
+    """
+    store = build_grade_store(results, profile)
+    with maybe_timer(profile, "frame_build"):
+        return store.to_frame()
+
+
+def build_grade_store(
+    results: List[FileResult],
+    profile: Optional[Profile] = None,
+) -> GradeStore:
+    """
+    Merge per-file results into a compact :class:`GradeStore` with GPAs
+    computed; the wide dataframe is left to ``store.to_frame()``.
+    """
+    with maybe_timer(profile, "grade_store"):
+        store = GradeStore.from_results(results)
+    with maybe_timer(profile, "gpa"):
+        store.gpa()
+    return store
+
+
+def _source_cache_key(source: Source, backend: str = "auto") -> Optional[str]:
+    """Cache key for (filename, bytes) and path sources; None for streams."""
+    if isinstance(source, tuple):
+        return parse_cache_key(*source, backend=backend)
+    if isinstance(source, (str, os.PathLike)):
+        mapped = _map_path(source)
+        try:
+            return parse_cache_key(
+                os.path.basename(os.fspath(source)), mapped, backend=backend
+            )
+        finally:
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+    return None
+
+
+def parse_file_results(
+    files: List[Source],
+    workers: Optional[int] = 1,
+    cache: Optional[ParseCache] = None,
+    profile: Optional[Profile] = None,
+    backend: str = "auto",
+    failed: Optional[Dict[int, str]] = None,
+) -> List[FileResult]:
+    """
+    Per-file parse results in input order, served from ``cache`` where
+    possible and parsed with ``workers`` processes otherwise.
+
+    By default the first file that cannot be parsed raises. When a
+    ``failed`` dict is given, errors are caught per file instead and
+    recorded there (input index -> message); such files give an empty
+    result and are not cached.
+
+    Files may be (filename, bytes) tuples or paths (memory-mapped, and
+    opened by the worker that parses them). File objects can only be parsed
+    with ``workers=1`` and are never cached. ``backend`` is passed on to
+    :func:`iter_sheet_rows`. With several workers, long sheets are split
+    into page ranges parsed concurrently and merged back in page order, so
+    the result is the same as parsing them whole.
+    """
+    results: List[Optional[FileResult]] = [None] * len(files)
+    keys: List[Optional[str]] = [None] * len(files)
+    missing: List[int] = []
+    for i, source in enumerate(files):
+        if cache is not None:
+            keys[i] = _source_cache_key(source, backend)
+            if keys[i] is not None:
+                results[i] = cache.get(keys[i])
+        if results[i] is None:
+            missing.append(i)
+
+    jobs, spilled = _plan_jobs(files, missing, workers)
+    try:
+        parsed = ordered_map(
+            partial(_parse_job, backend=backend, catch=failed is not None), jobs, workers
+        )
+    finally:
+        for path in spilled:
+            os.unlink(path)
+
+    ranges: Dict[int, List[Tuple[Optional[str], List[ParsedRow]]]] = {}
+    errors: Dict[int, str] = {}
+    for (i, _, _, pages), (result, job_profile, error) in zip(jobs, parsed):
+        if profile is not None:
+            profile.merge(job_profile)
+        if error is not None:
+            # A failed page range fails the whole sheet
+            errors.setdefault(i, error)
+        elif pages is None:
+            results[i] = result
+        else:
+            ranges.setdefault(i, []).append(result)
+    for i, parts in ranges.items():
+        if i not in errors:
+            results[i] = _merge_ranges(parts)
+            maybe_count(profile, "files_split")
+    for i, error in errors.items():
+        results[i] = (None, {})
+        failed[i] = error
+    if cache is not None:
+        for i in missing:
+            if keys[i] is not None and i not in errors:
+                cache.put(keys[i], results[i])
+    if errors:
+        maybe_count(profile, "files_failed", len(errors))
+
+    maybe_count(profile, "files", len(files))
+    maybe_count(profile, "files_cached", len(files) - len(missing))
+    return results
+
+
+def parse_result_pdfs(
+    files: List[Tuple[str, bytes]],
+    workers: Optional[int] = 1,
+    cache: Optional[ParseCache] = None,
+    profile: Optional[Profile] = None,
+    backend: str = "auto",
+) -> pd.DataFrame:
+    """
+    Parse multiple PDF result sheets into a wide student x module dataframe.
+
+    :param files: list of (filename, bytes) tuples
+    :param workers: number of worker processes (1 = serial, None = one per CPU)
+    :param cache: optional parse cache; only sheets missing from it are parsed
+    :param profile: optional profile to record stage timings and counters in
+    :param backend: extraction backend, see :func:`iter_sheet_rows`
+    :return: DataFrame with columns: Registration No, module codes..., GPA
+    """
+    results = parse_file_results(files, workers, cache, profile, backend)
+    return merge_file_results(results, profile)
+
+
+def parse_result_paths(
+    paths: List[str],
+    workers: Optional[int] = 1,
+    cache: Optional[ParseCache] = None,
+    profile: Optional[Profile] = None,
+    backend: str = "auto",
+    failed: Optional[Dict[int, str]] = None,
+) -> pd.DataFrame:
+    """
+    Like :func:`parse_result_pdfs`, for PDFs on disk. Files are
+    memory-mapped by the worker that parses them rather than read into
+    memory up front. See :func:`parse_file_results` for ``failed``.
+    """
+    results = parse_file_results(paths, workers, cache, profile, backend, failed)
+    return merge_file_results(results, profile)
@@ -0,0 +1,12 @@
+import re
+
+
+MODULE_PATTERN = re.compile(r"(IT\d{3,4})", re.IGNORECASE)
+GRADE_PATTERN = re.compile(r"^[A-F][+-]?$|^[0-9]{1,3}(?:\.[0-9]+)?$", re.IGNORECASE)
+REG_PATTERN = re.compile(r"^IT\w*", re.IGNORECASE)
+
+# REG_PATTERN and GRADE_PATTERN in one pass over a stripped cell: group 1 is
+# set for a registration number, a match without it is a grade. No cell can
+# be both (registration numbers start with "IT", grades with A-F or a
+# digit). Keep in step with the two patterns above.
+CELL_PATTERN = re.compile(r"(IT\w*)|(?:[A-F][+-]?|[0-9]{1,3}(?:\.[0-9]+)?)$", re.IGNORECASE)
@@ -0,0 +1,189 @@
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .grading import GP_MAP
+from .instrumentation import Profile, maybe_timer
+
+
+class Ranks(NamedTuple):
+    """Rank and percentile of every row, plus the cohort size (stored once)."""
+
+    rank: np.ndarray
+    percentile: np.ndarray
+    total: int
+
+
+def compute_ranks(gpa: pd.Series) -> Ranks:
+    """
+    Ranks (1 = best, ties share the best rank) and percentiles for a GPA
+    column, as standalone arrays; the frame holding it is not touched.
+    """
+    total = len(gpa)
+    rank = gpa.rank(ascending=False, method="min").to_numpy().astype(int)
+    pct = np.round((1 - (rank - 1) / total) * 100, 2)
+    return Ranks(rank, pct, total)
+
+
+def add_ranks(
+    df: pd.DataFrame, profile: Optional[Profile] = None, inplace: bool = False
+) -> pd.DataFrame:
+    """
+    Add rank (1 = best) and percentile columns based on GPA.
+
+    By default the frame is copied first; with ``inplace`` the columns are
+    added to ``df`` itself, which avoids holding two copies of a wide frame.
+    """
+    if "GPA" not in df.columns or df.empty:
+        return df
+
+    with maybe_timer(profile, "add_ranks"):
+        ranks = compute_ranks(df["GPA"])
+        if not inplace:
+            df = df.copy()
+        # Rank: higher GPA = better (rank 1)
+        df["Rank"] = ranks.rank
+        df["Total_Students"] = ranks.total
+        df["Percentile"] = ranks.percentile
+    return df
+
+
+def rank_table(df: pd.DataFrame, profile: Optional[Profile] = None) -> pd.DataFrame:
+    """
+    Narrow Rank / Percentile table indexed by registration number, for
+    frames too wide to copy. The cohort size is kept once, in
+    ``attrs["total_students"]``; see :func:`join_ranks` to display it.
+    """
+    with maybe_timer(profile, "rank_table"):
+        ranks = compute_ranks(df["GPA"])
+        table = pd.DataFrame(
+            {"Rank": ranks.rank, "Percentile": ranks.percentile},
+            index=pd.Index(df["Registration No"].to_numpy(), name="Registration No"),
+        )
+    table.attrs["total_students"] = ranks.total
+    return table
+
+
+def join_ranks(df: pd.DataFrame, table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rows of ``df`` (typically the slice being displayed) with the Rank,
+    Total_Students and Percentile columns of ``add_ranks`` joined from a
+    :func:`rank_table` by registration number.
+    """
+    out = df.join(table, on="Registration No")
+    out.insert(
+        out.columns.get_loc("Rank") + 1,
+        "Total_Students",
+        table.attrs["total_students"],
+    )
+    return out
+
+
+def percentile(rank: int, total: int) -> float:
+    """Percentile of a rank in a cohort, rounded as in ``add_ranks``."""
+    return float(np.round((1 - (rank - 1) / total) * 100, 2))
+
+
+class RankIndex:
+    """
+    Ranks of a changing cohort without re-ranking it.
+
+    GPAs have two decimals, so each one falls in its own 0.01-wide bucket
+    and a Fenwick tree of bucket counts answers "how many students are
+    above / below" in O(log buckets). Setting, updating or removing one
+    student's GPA is O(log buckets) too. Ranks follow ``add_ranks``
+    (``method="min"``): 1 + the number of students with a higher GPA.
+    """
+
+    def __init__(self, scale: int = 100, max_gpa: float = max(GP_MAP.values())):
+        self.scale = scale
+        self.size = int(round(max_gpa * scale)) + 1
+        self._tree = [0] * (self.size + 1)
+        self._keys: Dict[str, int] = {}
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[str, float]], **kwargs) -> "RankIndex":
+        index = cls(**kwargs)
+        for reg_no, gpa in items:
+            index.set(reg_no, gpa)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, reg_no: str) -> bool:
+        return reg_no in self._keys
+
+    def _key(self, gpa: float) -> int:
+        key = int(round(gpa * self.scale))
+        if not 0 <= key < self.size or abs(key - gpa * self.scale) > 1e-6:
+            raise ValueError(
+                f"GPA {gpa!r} is not a multiple of {1 / self.scale} "
+                f"between 0 and {(self.size - 1) / self.scale}"
+            )
+        return key
+
+    def _add(self, key: int, delta: int) -> None:
+        i = key + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_to(self, key: int) -> int:
+        """Students in buckets 0..key."""
+        total = 0
+        i = min(key, self.size - 1) + 1
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    # -- updates --
+
+    def set(self, reg_no: str, gpa: float) -> None:
+        """Insert a student, or move them to a new GPA."""
+        key = self._key(gpa)
+        old = self._keys.get(reg_no)
+        if old == key:
+            return
+        if old is not None:
+            self._add(old, -1)
+        self._add(key, 1)
+        self._keys[reg_no] = key
+
+    def discard(self, reg_no: str) -> None:
+        """Remove a student if present."""
+        old = self._keys.pop(reg_no, None)
+        if old is not None:
+            self._add(old, -1)
+
+    # -- queries --
+
+    def gpa(self, reg_no: str) -> Optional[float]:
+        key = self._keys.get(reg_no)
+        return None if key is None else key / self.scale
+
+    def above(self, gpa: float) -> int:
+        """Students with a GPA strictly above ``gpa``."""
+        return len(self._keys) - self._count_to(self._key(gpa))
+
+    def below(self, gpa: float) -> int:
+        """Students with a GPA strictly below ``gpa``."""
+        return self._count_to(self._key(gpa) - 1)
+
+    def rank_of(self, gpa: float) -> int:
+        """Rank a student with ``gpa`` has (or would have) in the cohort."""
+        return self.above(gpa) + 1
+
+    def rank(self, reg_no: str) -> Optional[int]:
+        """Rank (1 = best, ties share the best rank) of a student."""
+        key = self._keys.get(reg_no)
+        if key is None:
+            return None
+        return len(self._keys) - self._count_to(key) + 1
+
+    def percentile(self, reg_no: str) -> Optional[float]:
+        """Percentile of a student, as in ``add_ranks``."""
+        rank = self.rank(reg_no)
+        return None if rank is None else percentile(rank, len(self._keys))
@@ -0,0 +1,110 @@
+from typing import List, Optional, Tuple
+
+from .patterns import CELL_PATTERN, GRADE_PATTERN
+
+# A table row as extracted: one text cell per column (None for merged cells)
+TableRow = List[Optional[str]]
+
+# (registration no, grade) read from a row
+ParsedRow = Tuple[str, Optional[str]]
+
+_cell_match = CELL_PATTERN.match
+_grade_match = GRADE_PATTERN.match
+# REG_PATTERN matches exactly the cells starting with these (case-insensitive
+# matching also folds the dotted and dotless i)
+_REG_PREFIXES = frozenset(i + t for i in "Iiİı" for t in "Tt")
+
+
+def _scan(row: TableRow) -> Tuple[int, int, List[str]]:
+    """
+    Columns of the registration number (first match) and the grade (last
+    match), -1 where there is none, and the stripped cells. Each cell is
+    stripped and matched once.
+    """
+    cells = [cell.strip() if isinstance(cell, str) else "" for cell in row]
+    reg_col = grade_col = -1
+    for i, text in enumerate(cells):
+        if not text:
+            continue
+        m = _cell_match(text)
+        if m is None:
+            continue
+        if m.group(1) is not None:
+            if reg_col < 0:
+                reg_col = i
+        else:
+            grade_col = i
+    return reg_col, grade_col, cells
+
+
+def parse_row(row: TableRow) -> Optional[ParsedRow]:
+    """(registration no, grade) for a table row, or None if it has no reg no."""
+    if not row:
+        return None
+    reg_col, grade_col, cells = _scan(row)
+    if reg_col < 0:
+        return None
+    return cells[reg_col], cells[grade_col] if grade_col >= 0 else None
+
+
+class RowClassifier:
+    """
+    :func:`parse_row` for the rows of one table, remembering where the
+    registration number and grade were found.
+
+    Once a row has both, later rows of the same width read those two cells
+    directly, checking only the cells that would take precedence in a full
+    scan (before the registration number, after the grade). Any mismatch
+    falls back to the full scan, so results always equal ``parse_row``.
+    """
+
+    def __init__(self):
+        self.reg_col = -1
+        self.grade_col = -1
+        self.width = -1
+        # Rows answered from the remembered columns
+        self.hits = 0
+
+    def __call__(self, row: TableRow) -> Optional[ParsedRow]:
+        if not row:
+            return None
+        if len(row) == self.width:
+            reg_no = row[self.reg_col]
+            grade = row[self.grade_col]
+            if isinstance(reg_no, str) and isinstance(grade, str):
+                reg_no = reg_no.strip()
+                grade = grade.strip()
+                if (
+                    reg_no[:2] in _REG_PREFIXES
+                    and grade
+                    and _grade_match(grade)
+                    and not self._shadowed(row)
+                ):
+                    self.hits += 1
+                    return reg_no, grade
+
+        reg_col, grade_col, cells = _scan(row)
+        if reg_col < 0:
+            return None
+        if self.width < 0 and grade_col > reg_col:
+            self.reg_col, self.grade_col, self.width = reg_col, grade_col, len(row)
+        return cells[reg_col], cells[grade_col] if grade_col >= 0 else None
+
+    def _shadowed(self, row: TableRow) -> bool:
+        """Whether a full scan would pick another cell than the remembered ones."""
+        for cell in row[: self.reg_col]:
+            if isinstance(cell, str) and cell.strip()[:2] in _REG_PREFIXES:
+                return True
+        for cell in row[self.grade_col + 1:]:
+            if isinstance(cell, str):
+                text = cell.strip()
+                if text and _grade_match(text):
+                    return True
+        return False
+
+
+def parse_rows(rows: List[TableRow], classifier: Optional[RowClassifier] = None) -> List[ParsedRow]:
+    """(registration no, grade) of every row that has a registration number."""
+    if classifier is None:
+        classifier = RowClassifier()
+    return [parsed for parsed in map(classifier, rows) if parsed]
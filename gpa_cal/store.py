@@ -0,0 +1,188 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .grading import GP_MAP, _grade_to_gp, credit_vector, weighted_gpa
+
+
+# Code 0 is an empty cell; GP_MAP grades take codes 1..len(GP_MAP) and
+# anything else (numeric marks, odd casing) is OTHER with its raw text kept
+# on the side.
+GRADE_VOCAB: Tuple[str, ...] = tuple(GP_MAP)
+MISSING = 0
+OTHER = 255
+_CODES: Dict[str, int] = {grade: code for code, grade in enumerate(GRADE_VOCAB, start=1)}
+_CODE_GP = np.array(
+    [np.nan] + [GP_MAP[g] for g in GRADE_VOCAB] + [np.nan] * (OTHER - len(GRADE_VOCAB)),
+    dtype=np.float64,
+)
+_CODE_TEXT = np.array(
+    [None] + list(GRADE_VOCAB) + [None] * (OTHER - len(GRADE_VOCAB)), dtype=object
+)
+
+# Cohorts where fewer cells than this are filled are stored sparse
+SPARSE_DENSITY = 0.25
+
+
+class GradeStore:
+    """
+    Compact student x module grade table.
+
+    Grades are ``uint8`` codes into ``GRADE_VOCAB``; students and modules
+    are integer indexed (students in sorted registration order, modules
+    sorted). Storage is a dense code matrix, or CSR arrays (``indptr``,
+    ``indices``, ``codes``) when the cohort is sparse, e.g. when IT, SE and
+    IE sheets are mixed. The wide dataframe is only built by ``to_frame``.
+    """
+
+    def __init__(
+        self,
+        students: List[str],
+        modules: List[str],
+        rows: np.ndarray,
+        cols: np.ndarray,
+        codes: np.ndarray,
+        other: Dict[Tuple[int, int], str],
+        sparse: Optional[bool] = None,
+    ):
+        self.students = students
+        self.modules = modules
+        self.student_index = {reg_no: i for i, reg_no in enumerate(students)}
+        self.module_index = {mod: j for j, mod in enumerate(modules)}
+        self.other = other
+
+        shape = (len(students), len(modules))
+        density = len(codes) / max(shape[0] * shape[1], 1)
+        self.sparse = density < SPARSE_DENSITY if sparse is None else sparse
+
+        if self.sparse:
+            order = np.lexsort((cols, rows))
+            self.indices = cols[order].astype(np.int32)
+            self.codes = codes[order].astype(np.uint8)
+            self.indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=shape[0]), out=self.indptr[1:])
+            self.dense = None
+        else:
+            self.dense = np.zeros(shape, dtype=np.uint8)
+            self.dense[rows, cols] = codes
+        self._gpa: Optional[np.ndarray] = None
+        self._frame: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_results(
+        cls, results, sparse: Optional[bool] = None
+    ) -> "GradeStore":
+        """
+        Build from per-file ``(module, {reg no: grade})`` results in upload
+        order; later files win for duplicate cells, as in the wide merge.
+        """
+        student_ids: Dict[str, int] = {}
+        module_ids: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[Optional[str]] = []
+        for module_code, grades in results:
+            if not module_code or not grades:
+                continue
+            m = module_ids.setdefault(module_code, len(module_ids))
+            for reg_no, grade in grades.items():
+                rows.append(student_ids.setdefault(reg_no, len(student_ids)))
+                cols.append(m)
+                values.append(grade)
+
+        students = sorted(student_ids)
+        modules = sorted(module_ids)
+        student_map = np.empty(len(students), dtype=np.int64)
+        for i, reg_no in enumerate(students):
+            student_map[student_ids[reg_no]] = i
+        module_map = np.empty(len(modules), dtype=np.int64)
+        for j, mod in enumerate(modules):
+            module_map[module_ids[mod]] = j
+
+        r = student_map[np.asarray(rows, dtype=np.int64)]
+        c = module_map[np.asarray(cols, dtype=np.int64)]
+        codes = np.array(
+            [MISSING if v is None else _CODES.get(v, OTHER) for v in values],
+            dtype=np.uint8,
+        )
+
+        # Keep the last write to each cell: first occurrence in reverse order
+        flat = r * max(len(modules), 1) + c
+        _, first_rev = np.unique(flat[::-1], return_index=True)
+        last = len(flat) - 1 - first_rev
+        keep = last[codes[last] != MISSING]
+
+        other = {
+            (int(r[k]), int(c[k])): values[k]
+            for k in keep[codes[keep] == OTHER].tolist()
+        }
+        return cls(students, modules, r[keep], c[keep], codes[keep], other, sparse)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.students), len(self.modules)
+
+    @property
+    def nnz(self) -> int:
+        return int(len(self.codes) if self.sparse else np.count_nonzero(self.dense))
+
+    def nbytes(self) -> int:
+        """Bytes held by the code arrays (excluding the key lists)."""
+        if self.sparse:
+            return self.indptr.nbytes + self.indices.nbytes + self.codes.nbytes
+        return self.dense.nbytes
+
+    def _triples(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(row, col, code) arrays of every filled cell, row-major."""
+        if self.sparse:
+            rows = np.repeat(
+                np.arange(len(self.students), dtype=np.int64), np.diff(self.indptr)
+            )
+            return rows, self.indices.astype(np.int64), self.codes
+        rows, cols = np.nonzero(self.dense)
+        return rows, cols, self.dense[rows, cols]
+
+    def gpa(self) -> np.ndarray:
+        """GPA per student (NaN without graded credits), matching compute_gpa."""
+        if self._gpa is not None:
+            return self._gpa
+
+        rows, cols, codes = self._triples()
+        gp = _CODE_GP[codes]
+        for k in np.nonzero(codes == OTHER)[0].tolist():
+            # Raw text is looked up the same way the wide path does
+            value = _grade_to_gp(self.other[(int(rows[k]), int(cols[k]))])
+            if value is not None:
+                gp[k] = value
+        graded = ~np.isnan(gp)
+        self._gpa = weighted_gpa(
+            rows[graded],
+            cols[graded],
+            gp[graded],
+            credit_vector(self.modules),
+            len(self.students),
+        )
+        return self._gpa
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Wide dataframe (Registration No, modules..., GPA) for display and
+        export; students without a GPA are dropped. Built once and cached.
+        """
+        if self._frame is not None:
+            return self._frame
+        if not self.students:
+            return pd.DataFrame(columns=["Registration No", "GPA"])
+
+        block = np.full(self.shape, None, dtype=object)
+        rows, cols, codes = self._triples()
+        block[rows, cols] = _CODE_TEXT[codes]
+        for (i, j), text in self.other.items():
+            block[i, j] = text
+
+        df = pd.DataFrame(block, columns=self.modules)
+        df.insert(0, "Registration No", [str(s).replace(" ", "") for s in self.students])
+        df["GPA"] = self.gpa()
+        self._frame = df.dropna(subset=["GPA"])
+        return self._frame
@@ -0,0 +1,65 @@
+import re
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+
+from .rows import TableRow
+
+# A results line as it appears in the text layer of a plainly tabulated
+# sheet: row number, registration number, then marks / grade / status.
+LINE_PATTERN = re.compile(
+    r"^\s*(\d+)\s+(IT\s*\d{2}\s*\d{4}\s*\d{2})(?!\w)(.*)$", re.IGNORECASE
+)
+# Anything that looks like a registration number
+REG_HINT = re.compile(r"(?<!\w)IT\s*\d{2}\s*\d{4}\s*\d{2}(?!\w)", re.IGNORECASE)
+# A row number, then a word the table parser takes for a registration
+# number (REG_PATTERN: anything starting with "IT", dotted and dotless i
+# included), whatever its shape
+ROW_HINT = re.compile(r"^\s*\d+\s+IT", re.IGNORECASE)
+
+
+def read_text_pages(
+    stream: BinaryIO, pages: Optional[range] = None
+) -> Tuple[int, Dict[int, str]]:
+    """
+    Page count, and the text of every page (or of the page indexes in
+    ``pages``) straight from the content streams, without layout analysis.
+    """
+    reader = PdfReader(stream)
+    count = len(reader.pages)
+    indexes = range(count) if pages is None else range(count)[pages.start:pages.stop]
+    return count, {i: reader.pages[i].extract_text() or "" for i in indexes}
+
+
+def text_line_cells(line: str) -> Optional[TableRow]:
+    """
+    Cells of one results line (row number, registration number, then one
+    cell per remaining word), or None if it is not a results line.
+    """
+    m = LINE_PATTERN.match(line)
+    if not m:
+        return None
+    number, reg_no, rest = m.groups()
+    return [number, " ".join(reg_no.split()), *rest.split()]
+
+
+def text_page_rows(text: str) -> Optional[List[TableRow]]:
+    """
+    Table rows of one page's text, or None if the page has a line the line
+    parser cannot read that looks like a results row (a row number and a
+    word starting with "IT", or a registration number anywhere): wrapped
+    cells, merged lines, odd registration numbers, another layout. Such
+    sheets need a table extractor.
+    """
+    rows = []
+    for line in text.splitlines():
+        cells = text_line_cells(line)
+        if cells is None:
+            if ROW_HINT.match(line) or REG_HINT.search(line):
+                return None
+            continue
+        if REG_HINT.search(" ".join(cells[2:])):
+            # Two results lines run together
+            return None
+        rows.append(cells)
+    return rows
@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from gpa_cal.grading import CREDITS, GP_MAP, _grade_to_gp, compute_gpa, student_gpa
+from gpa_cal.parsing import merge_file_results
+
+GRADE_CELLS = list(GP_MAP) + [None, "a-", " b+ ", "55", "AB", "WH", ""]
+
+
+def baseline_gpa(df):
+    """The row-by-row GPA loop the vectorised paths replaced."""
+    module_cols = [c for c in df.columns if c != "Registration No"]
+    gpas = []
+    for _, row in df.iterrows():
+        total_points = 0.0
+        total_credits = 0.0
+        for mod in module_cols:
+            gp = _grade_to_gp(row.get(mod))
+            if gp is not None:
+                cr = CREDITS.get(mod, 1)
+                total_points += gp * cr
+                total_credits += cr
+        gpas.append(round(total_points / total_credits, 2) if total_credits > 0 else None)
+    return pd.Series(gpas, index=df.index, dtype="float64")
+
+
+def random_results(seed, students=400, sheets=8):
+    """Per-sheet results with repeated modules (later sheets win) and
+    modules with and without listed credits."""
+    rng = random.Random(seed)
+    modules = sorted(CREDITS)[:5] + ["IT9999", "XX1000"]
+    reg_nos = [f"IT2{n:07d}" for n in range(students)]
+    return [
+        (rng.choice(modules),
+         {r: rng.choice(GRADE_CELLS) for r in rng.sample(reg_nos, rng.randrange(1, students))})
+        for _ in range(sheets)
+    ]
+
+
+def wide_frame(results):
+    """Wide frame of the effective cells (later sheets win), GPA not added."""
+    cells = {}
+    for module, grades in results:
+        for reg_no, grade in grades.items():
+            cells.setdefault(reg_no, {})[module] = grade
+    modules = sorted({m for m, _ in results})
+    rows = [
+        {"Registration No": reg_no, **{m: mods.get(m) for m in modules}}
+        for reg_no, mods in sorted(cells.items())
+    ]
+    return pd.DataFrame(rows, columns=["Registration No", *modules]), cells
+
+
+def test_gpa_paths_match_baseline():
+    for seed in range(20):
+        results = random_results(seed)
+        wide, cells = wide_frame(results)
+        expected = baseline_gpa(wide)
+
+        vectorised = compute_gpa(wide.copy())["GPA"]
+        assert np.array_equal(vectorised.to_numpy(), expected.to_numpy(), equal_nan=True)
+
+        scalar = [student_gpa(cells[r]) for r in wide["Registration No"]]
+        assert np.array_equal(
+            np.array(scalar, dtype="float64"), expected.to_numpy(), equal_nan=True
+        )
+
+        merged = merge_file_results(results)
+        kept = expected.dropna()
+        assert merged.index.tolist() == kept.index.tolist()
+        assert merged["GPA"].tolist() == kept.tolist()
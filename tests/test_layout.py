@@ -0,0 +1,55 @@
+import io
+
+import pdfplumber
+import pytest
+
+from benchmarks.synthetic import (
+    COLUMN_X,
+    HEADER_LINES,
+    ROW_HEIGHT,
+    TABLE_TOP,
+    SheetSpec,
+    _page_stream,
+    build_pdf,
+    sheet_rows,
+)
+from gpa_cal import Profile, clear_templates, parse_pdf
+from gpa_cal.rows import parse_rows
+
+ROWS_PER_PAGE = 39
+
+
+def merged_row_sheet(merged_page):
+    """Four pages; on ``merged_page`` (0-based) the rule under one row
+    starts at the third column, merging that row's first two cells with
+    the next row's."""
+    header = [line.format(module="IT2010") for line in HEADER_LINES]
+    rows = sheet_rows(SheetSpec(students=4 * ROWS_PER_PAGE, noise_rate=0))
+    pages = [
+        _page_stream(header, rows[i:i + ROWS_PER_PAGE])
+        for i in range(0, len(rows), ROWS_PER_PAGE)
+    ]
+    ly = TABLE_TOP - ROW_HEIGHT * 10
+    full = f"{COLUMN_X[0]} {ly} m {COLUMN_X[-1]} {ly} l S".encode("latin-1")
+    short = f"{COLUMN_X[2]} {ly} m {COLUMN_X[-1]} {ly} l S".encode("latin-1")
+    assert pages[merged_page].count(full) == 1
+    pages[merged_page] = pages[merged_page].replace(full, short)
+    return "IT2010_merged.pdf", build_pdf(pages)
+
+
+def extract_table_grades(data):
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return dict(row for page in pdf.pages for row in parse_rows(page.extract_table()[1:]))
+
+
+# Page 0 is also the page a new layout's template would be learned from
+@pytest.mark.parametrize("merged_page", [0, 1])
+def test_partly_ruled_rows_fall_back_to_extract_table(merged_page):
+    filename, data = merged_row_sheet(merged_page)
+    expected = extract_table_grades(data)
+    clear_templates()
+    profile = Profile()
+    module, grades = parse_pdf((filename, data), profile, backend="pdfplumber")
+    assert len(expected) == 4 * ROWS_PER_PAGE - 1
+    assert grades == expected
+    assert profile.counters["template_pages"] == 2
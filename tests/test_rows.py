@@ -0,0 +1,83 @@
+import random
+import re
+
+from gpa_cal.rows import RowClassifier, parse_row
+
+# The row scan as it was before the combined cell pattern, kept as the
+# reference the faster classifiers must match.
+BASELINE_GRADE = re.compile(r"^[A-F][+-]?$|^[0-9]{1,3}(?:\.[0-9]+)?$", re.IGNORECASE)
+BASELINE_REG = re.compile(r"^IT\w*", re.IGNORECASE)
+
+
+def baseline_parse_row(row):
+    if not row:
+        return None
+
+    reg_no = None
+    for cell in row:
+        if isinstance(cell, str) and BASELINE_REG.match(cell.strip()):
+            reg_no = cell.strip()
+            break
+    if not reg_no:
+        return None
+
+    grade = None
+    for cell in reversed(row):
+        if isinstance(cell, str) and cell.strip():
+            val = cell.strip()
+            if BASELINE_GRADE.match(val):
+                grade = val
+                break
+    if not grade:
+        for idx in (3, 2, 4, 5):
+            if len(row) > idx and isinstance(row[idx], str) and row[idx].strip():
+                cand = row[idx].strip()
+                if BASELINE_GRADE.match(cand):
+                    grade = cand
+                    break
+
+    return reg_no, grade
+
+
+CELLS = [
+    None, "", " ", "1", "42", "55.0", "100", "1000", "3.", "A", "a+", "B-", "c",
+    "F", "G", "AB", "Pass", "Fail", "Repeat 2", "WH", "Absent",
+    "IT21000123", " IT 21 0001 23 ", "it2100\n9999", "İT21", "ıt21", "IT", "I T21",
+    "ITx", "B\n", "\tC+",
+]
+
+
+def random_rows(rng, n):
+    """Rows of a few widths, mostly in a sheet-like layout so the
+    classifier's remembered columns get used, with random rows mixed in."""
+    rows = []
+    for _ in range(n):
+        width = rng.choice([4, 5, 5, 5, 6])
+        if rng.random() < 0.7:
+            row = [str(rng.randrange(1, 500)), f"IT{rng.randrange(10**8):08d}",
+                   f"{rng.uniform(0, 100):.1f}", rng.choice(["A", "B+", "C", "E"]), "Pass"]
+            row = row[:width] + [rng.choice(CELLS) for _ in range(width - len(row))]
+            for _ in range(rng.randrange(3)):
+                row[rng.randrange(width)] = rng.choice(CELLS)
+        else:
+            row = [rng.choice(CELLS) for _ in range(width)]
+        rows.append(row)
+    return rows
+
+
+def test_parse_row_matches_baseline():
+    rng = random.Random(0)
+    for row in random_rows(rng, 20000) + [[], [None], ["IT1"]]:
+        assert parse_row(row) == baseline_parse_row(row), row
+
+
+def test_row_classifier_matches_baseline():
+    rng = random.Random(1)
+    hits = 0
+    for _ in range(200):
+        classifier = RowClassifier()
+        for row in random_rows(rng, 100):
+            assert classifier(row) == baseline_parse_row(row), row
+        hits += classifier.hits
+    # The remembered-column fast path was actually exercised
+    assert hits > 0
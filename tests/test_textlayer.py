@@ -0,0 +1,38 @@
+from benchmarks.synthetic import HEADER_LINES, SheetSpec, _page_stream, build_pdf, sheet_rows
+from gpa_cal import Profile, clear_templates, parse_pdf
+from gpa_cal.textlayer import text_page_rows
+
+ROWS_PER_PAGE = 39
+
+
+def odd_sheet():
+    """Five pages; page 2 (not one the auto backend samples) has results
+    rows whose registration numbers the line regex cannot read."""
+    header = [line.format(module="IT2010") for line in HEADER_LINES]
+    rows = sheet_rows(SheetSpec(students=5 * ROWS_PER_PAGE, noise_rate=0))
+    rows[ROWS_PER_PAGE + 5][1] = "IT2100012"
+    rows[ROWS_PER_PAGE + 6][1] = "IT21000123X"
+    pages = [
+        _page_stream(header, rows[i:i + ROWS_PER_PAGE])
+        for i in range(0, len(rows), ROWS_PER_PAGE)
+    ]
+    return "IT2010_odd.pdf", build_pdf(pages)
+
+
+def test_unreadable_results_lines_reject_the_page():
+    assert text_page_rows("1 IT 21 0001 23 55.0 B Pass\n2 IT2100012 55.0 B Pass") is None
+    assert text_page_rows("1 IT 21 0001 23 55.0 B Pass\n2 ıt21000123X 55.0 B Pass") is None
+    assert text_page_rows("IT2010 - Some Module\n1 IT 21 0001 23 55.0 B Pass") == [
+        ["1", "IT 21 0001 23", "55.0", "B", "Pass"]
+    ]
+
+
+def test_auto_falls_back_on_odd_registration_numbers():
+    source = odd_sheet()
+    clear_templates()
+    reference = parse_pdf(source, backend="pdfplumber")
+    profile = Profile()
+    auto = parse_pdf(source, profile, backend="auto")
+    assert len(reference[1]) == 5 * ROWS_PER_PAGE
+    assert auto == reference
+    assert profile.counters["backend_fallbacks"] == 1